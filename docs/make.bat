@@ -7,8 +7,13 @@ REM Command file for Sphinx documentation
 if "%SPHINXBUILD%" == "" (
 	set SPHINXBUILD=sphinx-build
 )
+if "%SPHINXOPTS%" == "" (
+	set SPHINXOPTS=-j auto
+)
 set SOURCEDIR=source
-set BUILDDIR=build
+if "%BUILDDIR%" == "" (
+	set BUILDDIR=build
+)
 
 if "%1" == "" goto help
 
@@ -2,10 +2,11 @@
 
 # -- Path setup --------------------------------------------------------------
 
+import os
 import sys
 from pathlib import Path
 
-sys.path.insert(0, Path(__file__).parent.parent)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 
 # -- Project information -----------------------------------------------------
@@ -30,6 +31,9 @@ autodoc_default_options = {
     "exclude-members": "__weakref__",
 }
 
+# Heavy dependencies are not needed to read docstrings
+autodoc_mock_imports = ["networkx", "numpy", "pandas"]
+
 templates_path = ["_templates"]
 
 exclude_patterns = ["_build", "Thumbs.db", ".DS_Store"]
@@ -37,23 +41,42 @@ exclude_patterns = ["_build", "Thumbs.db", ".DS_Store"]
 
 # -- Options for HTML output -------------------------------------------------
 
-html_theme = "sphinx_rtd_theme"
+# Theme is chosen at build time, e.g. EASYLAMMPS_SPHINX_THEME=pydata_sphinx_theme
+html_theme = os.environ.get("EASYLAMMPS_SPHINX_THEME", "sphinx_rtd_theme")
 
 # html_logo = "_static/logo.png"
 
-html_theme_options = {
-    "canonical_url": "https://github.com/kkempfer/easylammps/docs",
-    "logo_only": True,
-    "display_version": True,
-    "prev_next_buttons_location": "both",
-    "style_external_links": False,
-    "style_nav_header_background": None,
-    # Toc options
-    "collapse_navigation": True,
-    "sticky_navigation": True,
-    "navigation_depth": 4,
-    "includehidden": True,
-    "titles_only": False,
-}
+if html_theme == "pydata_sphinx_theme":
+    html_theme_options = {
+        "github_url": "https://github.com/kkempfer/easylammps",
+        "external_links": [{"url": "https://lammps.sandia.gov", "name": "LAMMPS"}],
+        "use_edit_page_button": True,
+        "search_bar_position": "sidebar",  # navbar
+        "navigation_with_keys": True,
+        "show_toc_level": 2,
+    }
+
+    html_context = {
+        "github_url": "https://github.com",
+        "github_user": "kkempfer",
+        "github_repo": "easylammps",
+        "github_version": "main",
+        "doc_path": "docs/source",
+    }
+else:
+    html_theme_options = {
+        "canonical_url": "https://github.com/kkempfer/easylammps/docs",
+        "logo_only": True,
+        "display_version": True,
+        "prev_next_buttons_location": "both",
+        "style_external_links": False,
+        "style_nav_header_background": None,
+        # Toc options
+        "collapse_navigation": True,
+        "sticky_navigation": True,
+        "navigation_depth": 4,
+        "includehidden": True,
+        "titles_only": False,
+    }
 
 html_static_path = ["_static"]
@@ -1,7 +1,9 @@
 """Python library to manage LAMMPS AveChunk file."""
 
-import gzip
-import pandas as pd
+import itertools
+import weakref
+
+from .utils import blocks_to_pandas, open_file, parse_block, read_blocks
 
 
 class AveChunk(object):
@@ -16,33 +18,38 @@ class AveChunk(object):
     ----------
     filename : str, default 'velocity.chunk'
         LAMMPS AveChunk file.
+    parallel : bool, default False
+        Decompress gzipped file on all cores, requires `rapidgzip`.
 
     Examples
     --------
+    Read all configurations and close the file on exit:
+
+    >>> with AveChunk("velocity.chunk") as f:
+    ...     df = f.to_pandas()
     """
 
-    def __init__(self, filename="velocity.chunk"):
+    __slots__ = (
+        "filename",
+        "f",
+        "header",
+        "fields",
+        "_int_cols",
+        "_raw",
+        "__weakref__",
+    )
+
+    def __init__(self, filename="velocity.chunk", parallel=False):
 
         self.filename = filename
 
-        # Try first gzip and fall back to normal if failed
-        try:
-            self.f = gzip.open(filename, "rt")
-            # Test the read
-            self.f.readline()
-            self.f.close()
-            # If OK, reopen it
-            self.f = gzip.open(filename, "rt")
-        except IOError:
-            self.f = open(filename, "r")
-            # Test the read
-            self.f.readline()
-            self.f.close()
-            # If OK, reopen it
-            self.f = open(filename, "r")
+        # Open in binary mode, only header lines are decoded
+        self.f = open_file(filename, parallel=parallel)
+        # Close the file if the reader is garbage collected without `with`
+        weakref.finalize(self, self.f.close)
 
         # Read the first line header
-        line = self.f.readline()
+        line = self.f.readline().decode()
         if not line.startswith("# Chunk-averaged data for fix"):
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS AveChunk file".format(
@@ -52,7 +59,7 @@ class AveChunk(object):
         self.header = line.split("#", 1)[1].strip()
 
         # Read the second line header
-        line = self.f.readline()
+        line = self.f.readline().decode()
         if line.strip() != "# Timestep Number-of-chunks Total-count":
             # TimeStep is written Timestep by default (typography mistake)
             raise ValueError(
@@ -62,7 +69,7 @@ class AveChunk(object):
             )
 
         # Read the third line header
-        line = self.f.readline()
+        line = self.f.readline().decode()
         if not line.startswith("# Chunk"):
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS AveChunk file".format(
@@ -72,7 +79,19 @@ class AveChunk(object):
 
         self.fields = line.split("#")[1].split()
 
-    def __del__(self):
+        # Columns are integers until a float value is parsed
+        self._int_cols = [True] * len(self.fields)
+
+        self._raw = self._iter_raw()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the LAMMPS AveChunk file."""
         try:
             self.f.close()
         except Exception:
@@ -92,28 +111,35 @@ class AveChunk(object):
         """
         conf = {}
 
-        line = self.f.readline()
-        if line == "":
-            raise StopIteration
+        conf["TimeStep"], conf["Number-of-chunks"], lines = next(self._raw)
+
+        # Next Number-of-chunks lines, fewer if truncated, parsed at once
+        columns = parse_block(lines, len(self.fields), self._int_cols)
+        for field, values in zip(self.fields, columns):
+            conf[field] = values
 
-        # First line
-        values = line.split()
-        conf["TimeStep"] = int(values[0])
-        conf["Number-of-chunks"] = int(values[1])
+        return conf
 
-        # Next Number-of-chunks lines
-        for field in self.fields:
-            conf[field] = []
-        for _ in range(conf["Number-of-chunks"]):
-            line = self.f.readline()
+    def _iter_raw(self):
+        """
+        Iterate over the configurations without parsing them.
+
+        Yields
+        ------
+        timestep : int
+            Timestep of the configuration.
+        nb : int
+            Number of chunks of the configuration.
+        lines : list of bytes
+            Raw lines of the configuration.
+        """
+        for line in self.f:
+            # First line
             values = line.split()
-            for field, value in zip(self.fields, values):
-                try:
-                    conf[field].append(int(value))
-                except ValueError:
-                    conf[field].append(float(value))
+            nb = int(values[1])
 
-        return conf
+            # Next Number-of-chunks lines
+            yield int(values[0]), nb, list(itertools.islice(self.f, nb))
 
     def to_pandas(self):
         """
@@ -125,16 +151,5 @@ class AveChunk(object):
             MultiIndex pandas DataFrame, where the first index
             is the timestep and the second index is the first field.
         """
-        df = pd.DataFrame([])
-
-        for conf in self:
-            iterables = [[conf["TimeStep"]], conf[self.fields[0]]]
-            index = pd.MultiIndex.from_product(
-                iterables, names=["TimeStep", self.fields[0]]
-            )
-            columns = self.fields[1:]
-
-            df_ = pd.DataFrame(conf, index=index, columns=columns)
-            df = pd.concat([df, df_])
-
-        return df
+        # Read the remaining configurations at once
+        return blocks_to_pandas(self.fields, *read_blocks(self.f))
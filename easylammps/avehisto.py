@@ -1,10 +1,12 @@
 """Python library to manage LAMMPS AveHisto file."""
 
+import itertools
 import logging
-import gzip
-import pandas as pd
+import weakref
 import numpy as np
 
+from .utils import blocks_to_pandas, open_file, parse_block, read_blocks
+
 
 class AveHisto(object):
     """
@@ -18,33 +20,38 @@ class AveHisto(object):
     ----------
     filename : str, default 'bond.histo'
         LAMMPS AveHisto file.
+    parallel : bool, default False
+        Decompress gzipped file on all cores, requires `rapidgzip`.
 
     Examples
     --------
+    Read all configurations and close the file on exit:
+
+    >>> with AveHisto("bond.histo") as f:
+    ...     df = f.to_pandas()
     """
 
-    def __init__(self, filename="bond.histo"):
+    __slots__ = (
+        "filename",
+        "f",
+        "header",
+        "fields",
+        "_int_cols",
+        "_raw",
+        "__weakref__",
+    )
+
+    def __init__(self, filename="bond.histo", parallel=False):
 
         self.filename = filename
 
-        # Try first gzip and fall back to normal if failed
-        try:
-            self.f = gzip.open(filename, "rt")
-            # Test the read
-            self.f.readline()
-            self.f.close()
-            # If OK, reopen it
-            self.f = gzip.open(filename, "rt")
-        except IOError:
-            self.f = open(filename, "r")
-            # Test the read
-            self.f.readline()
-            self.f.close()
-            # If OK, reopen it
-            self.f = open(filename, "r")
+        # Open in binary mode, only header lines are decoded
+        self.f = open_file(filename, parallel=parallel)
+        # Close the file if the reader is garbage collected without `with`
+        weakref.finalize(self, self.f.close)
 
         # Read the first line header
-        line = self.f.readline()
+        line = self.f.readline().decode()
         if not line.startswith("# Histogrammed data for fix"):
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS AveHisto file".format(
@@ -54,7 +61,7 @@ class AveHisto(object):
         self.header = line.split("#", 1)[1].strip()
 
         # Read the second line header
-        line = self.f.readline()
+        line = self.f.readline().decode()
         if (
             line.strip()
             != "# TimeStep Number-of-bins Total-counts Missing-counts Min-value Max-value"
@@ -66,7 +73,7 @@ class AveHisto(object):
             )
 
         # Read the third line header
-        line = self.f.readline()
+        line = self.f.readline().decode()
         if line.strip() != "# Bin Coord Count Count/Total":
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS AveHisto file".format(
@@ -76,7 +83,19 @@ class AveHisto(object):
 
         self.fields = line.split("#")[1].split()
 
-    def __del__(self):
+        # Columns are integers until a float value is parsed
+        self._int_cols = [True] * len(self.fields)
+
+        self._raw = self._iter_raw()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the LAMMPS AveHisto file."""
         try:
             self.f.close()
         except Exception:
@@ -96,12 +115,9 @@ class AveHisto(object):
         """
         conf = {}
 
-        line = self.f.readline()
-        if line == "":
-            raise StopIteration
+        values, lines = next(self._raw)
 
         # First line
-        values = line.split()
         conf["TimeStep"] = int(values[0])
         conf["Number-of-bins"] = int(values[1])
         conf["Total-counts"] = int(
@@ -111,25 +127,44 @@ class AveHisto(object):
         conf["Min-value"] = float(values[4])
         conf["Max-value"] = float(values[5])
 
-        # Check if missing counts
-        if conf["Missing-counts"] != 0:
-            logging.warning(
-                "Missing counts is not zero ({:d}).".format(conf["Missing-counts"])
-            )
+        # Next Number-of-bins lines, fewer if truncated, parsed at once
+        columns = parse_block(lines, len(self.fields), self._int_cols)
+        for field, values in zip(self.fields, columns):
+            conf[field] = values
+
+        return conf
 
-        # Next Number-of-bins lines
-        for field in self.fields:
-            conf[field] = []
-        for _ in range(conf["Number-of-bins"]):
-            line = self.f.readline()
+    def _iter_raw(self):
+        """
+        Iterate over the configurations without parsing them.
+
+        Yields
+        ------
+        values : list of bytes
+            Values of the first line of the configuration.
+        lines : list of bytes
+            Raw lines of the configuration.
+        """
+        for line in self.f:
+            # First line
             values = line.split()
-            for field, value in zip(self.fields, values):
-                try:
-                    conf[field].append(int(value))
-                except ValueError:
-                    conf[field].append(float(value))
 
-        return conf
+            self._check_missing_counts(values)
+
+            # Next Number-of-bins lines
+            yield values, list(itertools.islice(self.f, int(values[1])))
+
+    def _check_missing_counts(self, values):
+        """
+        Warn if the configuration has missing counts.
+
+        Parameters
+        ----------
+        values : list of bytes
+            Values of the first line of the configuration.
+        """
+        if int(values[3]) != 0:
+            logging.warning("Missing counts is not zero ({:d}).".format(int(values[3])))
 
     def to_pandas(self, norm=True):
         """
@@ -146,20 +181,76 @@ class AveHisto(object):
             MultiIndex pandas DataFrame, where the first index
             is the timestep and the second index is the first field.
         """
-        df = pd.DataFrame([])
+        # Read the remaining configurations at once
+        heads, nbs, data = read_blocks(self.f)
+        for values in heads:
+            self._check_missing_counts(values)
 
-        for conf in self:
-            iterables = [[conf["TimeStep"]], conf[self.fields[0]]]
-            index = pd.MultiIndex.from_product(
-                iterables, names=["TimeStep", self.fields[0]]
-            )
-            columns = self.fields[1:]
+        return self._to_pandas(heads, nbs, data, norm=norm)
 
-            df_ = pd.DataFrame(conf, index=index, columns=columns)
-            if norm:
-                df_["Norm"] = df_[self.fields[2]] / np.trapz(
-                    df_[self.fields[2]], df_[self.fields[1]]
-                )
-            df = pd.concat([df, df_])
+    def to_pandas_chunks(self, chunksize=1000, norm=True):
+        """
+        Convert into pandas DataFrames of `chunksize` configurations each.
+
+        Parameters
+        ----------
+        chunksize : int, default 1000
+            Number of configurations per pandas DataFrame.
+        norm : bool, default 'True'
+            Add normalized 'Norm' column to pandas DataFrames.
+
+        Yields
+        ------
+        pandas.DataFrame
+            MultiIndex pandas DataFrame, where the first index
+            is the timestep and the second index is the first field.
+        """
+        while True:
+            confs = list(itertools.islice(self._raw, chunksize))
+            if confs == []:
+                break
+            heads = [values for values, _ in confs]
+            nbs = [len(lines) for _, lines in confs]
+            data = b"".join(line for _, lines in confs for line in lines)
+            yield self._to_pandas(heads, nbs, data, norm=norm)
+
+    def _to_pandas(self, heads, nbs, data, norm=True):
+        """
+        Convert raw configurations into a pandas DataFrame.
+
+        Parameters
+        ----------
+        heads : list of list of bytes
+            Values of the first line of each configuration.
+        nbs : list of int
+            Number of lines of each configuration.
+        data : bytes
+            Lines of all configurations, without their first line.
+        norm : bool, default 'True'
+            Add normalized 'Norm' column to pandas DataFrame.
+
+        Returns
+        -------
+        pandas.DataFrame
+            MultiIndex pandas DataFrame, where the first index
+            is the timestep and the second index is the first field.
+        """
+        df = blocks_to_pandas(self.fields, heads, nbs, data)
+        if df.empty:
+            return df
+
+        if norm:
+            count = df[self.fields[2]].to_numpy(dtype=float)
+            coord = df[self.fields[1]].to_numpy(dtype=float)
+
+            # Trapezoidal integral of all configurations at once, the areas
+            # between the last and first bins of two configurations are
+            # discarded
+            areas = np.append(np.diff(coord) * (count[1:] + count[:-1]) / 2.0, 0.0)
+            nbs = np.array(nbs)
+            nbs = nbs[nbs > 0]
+            starts = np.cumsum(nbs) - nbs
+            areas[starts[1:] - 1] = 0.0
+            df["Norm"] = count / np.repeat(np.add.reduceat(areas, starts), nbs)
 
         return df
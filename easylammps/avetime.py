@@ -1,8 +1,11 @@
 """Python library to manage LAMMPS AveTime file."""
 
-import gzip
+import itertools
+import weakref
 import pandas as pd
 
+from .utils import blocks_to_pandas, open_file, parse_block, read_blocks
+
 
 class AveTime(object):
     """
@@ -18,33 +21,39 @@ class AveTime(object):
         LAMMPS AveTime file.
     run : str, default 'vector'
         `mode` in LAMMPS `fix ave/time` command.
+    parallel : bool, default False
+        Decompress gzipped file on all cores, requires `rapidgzip`.
 
     Examples
     --------
+    Read all configurations and close the file on exit:
+
+    >>> with AveTime("rdf.time") as f:
+    ...     df = f.to_pandas()
     """
 
-    def __init__(self, filename="rdf.time", mode="vector"):
+    __slots__ = (
+        "filename",
+        "f",
+        "header",
+        "mode",
+        "fields",
+        "_int_cols",
+        "_raw",
+        "__weakref__",
+    )
+
+    def __init__(self, filename="rdf.time", mode="vector", parallel=False):
 
         self.filename = filename
 
-        # Try first gzip and fall back to normal if failed
-        try:
-            self.f = gzip.open(filename, "rt")
-            # Test the read
-            self.f.readline()
-            self.f.close()
-            # If OK, reopen it
-            self.f = gzip.open(filename, "rt")
-        except IOError:
-            self.f = open(filename, "r")
-            # Test the read
-            self.f.readline()
-            self.f.close()
-            # If OK, reopen it
-            self.f = open(filename, "r")
+        # Open in binary mode, only header lines are decoded
+        self.f = open_file(filename, parallel=parallel)
+        # Close the file if the reader is garbage collected without `with`
+        weakref.finalize(self, self.f.close)
 
         # Read the first line header
-        line = self.f.readline()
+        line = self.f.readline().decode()
         if not line.startswith("# Time-averaged data for fix"):
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS AveTime file".format(
@@ -56,7 +65,7 @@ class AveTime(object):
         self.mode = mode
 
         # Read the second line header
-        line = self.f.readline()
+        line = self.f.readline().decode()
 
         if self.mode == "vector":
             if line.strip() != "# TimeStep Number-of-rows":
@@ -78,7 +87,7 @@ class AveTime(object):
 
         # Read the third line header only if mode is vector
         if self.mode == "vector":
-            line = self.f.readline()
+            line = self.f.readline().decode()
             if not line.startswith("# Row"):
                 raise ValueError(
                     "File {:s} does not seem to be a valid LAMMPS AveTime file".format(
@@ -88,7 +97,19 @@ class AveTime(object):
 
             self.fields = line.split("#")[1].split()
 
-    def __del__(self):
+            # Columns are integers until a float value is parsed
+            self._int_cols = [True] * len(self.fields)
+
+            self._raw = self._iter_raw()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the LAMMPS AveTime file."""
         try:
             self.f.close()
         except Exception:
@@ -108,31 +129,24 @@ class AveTime(object):
         """
         conf = {}
 
-        line = self.f.readline()
-        if line == "":
-            raise StopIteration
-
-        values = line.split()
-        conf["TimeStep"] = int(values[0])
-
         if self.mode == "vector":
 
-            conf["Number-of-rows"] = int(values[1])
+            conf["TimeStep"], conf["Number-of-rows"], lines = next(self._raw)
 
-            # Next Number-of-rows lines
-            for field in self.fields:
-                conf[field] = []
-            for _ in range(conf["Number-of-rows"]):
-                line = self.f.readline()
-                values = line.split()
-                for field, value in zip(self.fields, values):
-                    try:
-                        conf[field].append(int(value))
-                    except ValueError:
-                        conf[field].append(float(value))
+            # Next Number-of-rows lines, fewer if truncated, parsed at once
+            columns = parse_block(lines, len(self.fields), self._int_cols)
+            for field, values in zip(self.fields, columns):
+                conf[field] = values
 
         elif self.mode == "scalar":
 
+            line = self.f.readline()
+            if line == b"":
+                raise StopIteration
+
+            values = line.split()
+            conf["TimeStep"] = int(values[0])
+
             for field, value in zip(self.fields, values[1:]):
                 try:
                     conf[field] = int(value)
@@ -141,6 +155,29 @@ class AveTime(object):
 
         return conf
 
+    def _iter_raw(self):
+        """
+        Iterate over the configurations without parsing them.
+
+        Only used if `mode` is 'vector'.
+
+        Yields
+        ------
+        timestep : int
+            Timestep of the configuration.
+        nb : int
+            Number of rows of the configuration.
+        lines : list of bytes
+            Raw lines of the configuration.
+        """
+        for line in self.f:
+            # First line
+            values = line.split()
+            nb = int(values[1])
+
+            # Next Number-of-rows lines
+            yield int(values[0]), nb, list(itertools.islice(self.f, nb))
+
     def to_pandas(self):
         """
         Convert into a pandas DataFrame.
@@ -155,21 +192,58 @@ class AveTime(object):
         """
         if self.mode == "vector":
 
-            df = pd.DataFrame([])
+            # Read the remaining configurations at once
+            df = blocks_to_pandas(self.fields, *read_blocks(self.f))
 
-            for conf in self:
-                iterables = [[conf["TimeStep"]], conf[self.fields[0]]]
-                index = pd.MultiIndex.from_product(
-                    iterables, names=["TimeStep", self.fields[0]]
-                )
-                columns = self.fields[1:]
+        elif self.mode == "scalar":
 
-                df_ = pd.DataFrame(conf, index=index, columns=columns)
-                df = pd.concat([df, df_])
+            columns = ["TimeStep", *self.fields]
+
+            # Parse the remaining lines at once with the pandas C engine
+            try:
+                df = pd.read_csv(self.f, sep=r"\s+", header=None, names=columns)
+            except pd.errors.EmptyDataError:
+                df = pd.DataFrame([], columns=columns)
+
+        return df
+
+    def to_pandas_chunks(self, chunksize=1000):
+        """
+        Convert into pandas DataFrames of `chunksize` configurations each.
+
+        Parameters
+        ----------
+        chunksize : int, default 1000
+            Number of configurations per pandas DataFrame.
+
+        Yields
+        ------
+        pandas.DataFrame
+            Same as `to_pandas()`, restricted to `chunksize` configurations.
+        """
+        if self.mode == "vector":
+
+            while True:
+                confs = list(itertools.islice(self._raw, chunksize))
+                if confs == []:
+                    break
+                heads = [[timestep, nb] for timestep, nb, _ in confs]
+                nbs = [len(lines) for _, _, lines in confs]
+                data = b"".join(line for _, _, lines in confs for line in lines)
+                yield blocks_to_pandas(self.fields, heads, nbs, data)
 
         elif self.mode == "scalar":
 
             columns = ["TimeStep", *self.fields]
-            df = pd.DataFrame(list(self), columns=columns)
 
-        return df
+            try:
+                reader = pd.read_csv(
+                    self.f,
+                    sep=r"\s+",
+                    header=None,
+                    names=columns,
+                    chunksize=chunksize,
+                )
+            except pd.errors.EmptyDataError:
+                return
+            yield from reader
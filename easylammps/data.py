@@ -1,12 +1,89 @@
 """Python library to manage LAMMPS Data object."""
 
+import functools
 import itertools
 import logging
+import sys
 
-import networkx as nx
+from .utils import READ_BUFFER_SIZE
 
 supported_atom_styles = ["full", "molecular", "charge"]
 
+section_keywords = frozenset(
+    [
+        "Masses",
+        "Pair Coeffs",
+        "PairIJ Coeffs",
+        "Bond Coeffs",
+        "Angle Coeffs",
+        "Dihedral Coeffs",
+        "Improper Coeffs",
+        "Atoms",
+        "Velocities",
+        "Bonds",
+        "Angles",
+        "Dihedrals",
+        "Impropers",
+    ]
+)
+
+
+def format_comment(d):
+    """
+    Format the end of a line, with comment if d contains a comment value.
+
+    Parameters
+    ----------
+    d : dict
+        May contain a comment value.
+
+    Returns
+    -------
+    str
+        Comment, if any, and newline.
+    """
+    if "comment" in d and d["comment"] is not None:
+        return " # {:s}\n".format(d["comment"])
+    else:
+        return "\n"
+
+
+def format_image_flags(atom):
+    """
+    Format image flags of an atom, if available.
+
+    Parameters
+    ----------
+    atom : dict
+        May contain image flags values.
+
+    Returns
+    -------
+    str
+        Image flags, each one preceded by a space, or empty string.
+    """
+    if "nx" in atom and "ny" in atom and "nz" in atom:
+        return " {:d} {:d} {:d}".format(atom["nx"], atom["ny"], atom["nz"])
+    else:
+        return ""
+
+
+def format_coeffs(coeffs):
+    """
+    Format coefficients on a single line.
+
+    Parameters
+    ----------
+    coeffs : list
+        Coefficients.
+
+    Returns
+    -------
+    str
+        Coefficients, each one preceded by a space.
+    """
+    return "".join(" {:9.4f}".format(coeff) for coeff in coeffs)
+
 
 def write_comment(f, d):
     """
@@ -19,10 +96,37 @@ def write_comment(f, d):
     d : dict
         May contain a comment value.
     """
-    if "comment" in d and d["comment"] is not None:
-        f.write(" # {:s}\n".format(d["comment"]))
-    else:
-        f.write("\n")
+    f.write(format_comment(d))
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_coeff(c, keep_int=False):
+    """
+    Parse a coefficient of a coeffs line.
+
+    The same literals are repeated over coeffs lines, results are cached.
+
+    Parameters
+    ----------
+    c : str
+        Coefficient, or style.
+    keep_int : bool, default False
+        Keep integer coefficients as int.
+
+    Returns
+    -------
+    int, float or str
+        Parsed coefficient, or `c` itself if it is a style.
+    """
+    if keep_int:
+        try:
+            return int(c)
+        except ValueError:
+            pass
+    try:
+        return float(c)
+    except ValueError:
+        return c
 
 
 def expand_ids(ids, idmax):
@@ -38,21 +142,17 @@ def expand_ids(ids, idmax):
 
     Returns
     -------
-    tuple
-        Expanded indices.
+    range
+        Expanded indices, not materialized.
     """
     if "*" not in ids:
-        return tuple([int(ids)])
+        i = int(ids)
+        return range(i, i + 1)
     else:
-        if ids.startswith("*"):
-            istart = 1
-        else:
-            istart = int(ids.split("*")[0])
-        if ids.endswith("*"):
-            iend = idmax
-        else:
-            iend = int(ids.split("*")[1])
-        return tuple(range(istart, iend + 1))
+        start, end = ids.split("*", 1)
+        istart = int(start) if start != "" else 1
+        iend = int(end) if end != "" else idmax
+        return range(istart, iend + 1)
 
 
 class Data(object):
@@ -184,13 +284,11 @@ class Data(object):
         if comment is not None:
             atom_type["comment"] = comment
 
-        try:
-            self.atom_types[i - 1] = atom_type
-        except IndexError:
+        if i > len(self.atom_types):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.atom_types.extend([None] * (i - len(self.atom_types)))
-            self.atom_types[i - 1] = atom_type
+        self.atom_types[i - 1] = atom_type
 
     def add_pair_type(
         self,
@@ -248,13 +346,11 @@ class Data(object):
         if comment is not None:
             bond_type["comment"] = comment
 
-        try:
-            self.bond_types[i - 1] = bond_type
-        except IndexError:
+        if i > len(self.bond_types):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.bond_types.extend([None] * (i - len(self.bond_types)))
-            self.bond_types[i - 1] = bond_type
+        self.bond_types[i - 1] = bond_type
 
     def add_angle_type(self, i=None, coeffs=None, style=None, comment=None):
         """
@@ -277,13 +373,11 @@ class Data(object):
         if comment is not None:
             angle_type["comment"] = comment
 
-        try:
-            self.angle_types[i - 1] = angle_type
-        except IndexError:
+        if i > len(self.angle_types):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.angle_types.extend([None] * (i - len(self.angle_types)))
-            self.angle_types[i - 1] = angle_type
+        self.angle_types[i - 1] = angle_type
 
     def add_dihedral_type(self, i=None, coeffs=None, style=None, comment=None):
         """
@@ -306,13 +400,11 @@ class Data(object):
         if comment is not None:
             dihedral_type["comment"] = comment
 
-        try:
-            self.dihedral_types[i - 1] = dihedral_type
-        except IndexError:
+        if i > len(self.dihedral_types):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.dihedral_types.extend([None] * (i - len(self.dihedral_types)))
-            self.dihedral_types[i - 1] = dihedral_type
+        self.dihedral_types[i - 1] = dihedral_type
 
     def add_improper_type(self, i=None, coeffs=None, style=None, comment=None):
         """
@@ -335,13 +427,11 @@ class Data(object):
         if comment is not None:
             improper_type["comment"] = comment
 
-        try:
-            self.improper_types[i - 1] = improper_type
-        except IndexError:
+        if i > len(self.improper_types):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.improper_types.extend([None] * (i - len(self.improper_types)))
-            self.improper_types[i - 1] = improper_type
+        self.improper_types[i - 1] = improper_type
 
     def add_atom(
         self,
@@ -421,13 +511,11 @@ class Data(object):
         if comment is not None:
             atom["comment"] = comment
 
-        try:
-            self.atoms[i - 1] = atom
-        except IndexError:
+        if i > len(self.atoms):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.atoms.extend([None] * (i - len(self.atoms)))
-            self.atoms[i - 1] = atom
+        self.atoms[i - 1] = atom
 
     def add_bond(self, atom_is, i=None, bond_type=None, comment=None):
         """
@@ -453,13 +541,11 @@ class Data(object):
         if comment is not None:
             bond["comment"] = comment
 
-        try:
-            self.bonds[i - 1] = bond
-        except IndexError:
+        if i > len(self.bonds):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.bonds.extend([None] * (i - len(self.bonds)))
-            self.bonds[i - 1] = bond
+        self.bonds[i - 1] = bond
 
     def add_angle(self, atom_is, i=None, angle_type=None, comment=None):
         """
@@ -492,13 +578,11 @@ class Data(object):
         if comment is not None:
             angle["comment"] = comment
 
-        try:
-            self.angles[i - 1] = angle
-        except IndexError:
+        if i > len(self.angles):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.angles.extend([None] * (i - len(self.angles)))
-            self.angles[i - 1] = angle
+        self.angles[i - 1] = angle
 
     def add_dihedral(self, atom_is, i=None, dihedral_type=None, comment=None):
         """
@@ -533,13 +617,11 @@ class Data(object):
         if comment is not None:
             dihedral["comment"] = comment
 
-        try:
-            self.dihedrals[i - 1] = dihedral
-        except IndexError:
+        if i > len(self.dihedrals):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.dihedrals.extend([None] * (i - len(self.dihedrals)))
-            self.dihedrals[i - 1] = dihedral
+        self.dihedrals[i - 1] = dihedral
 
     def add_improper(self, atom_is, i=None, improper_type=None, comment=None):
         """
@@ -574,13 +656,11 @@ class Data(object):
         if comment is not None:
             improper["comment"] = comment
 
-        try:
-            self.impropers[i - 1] = improper
-        except IndexError:
+        if i > len(self.impropers):
             # There are holes in the list, grow list
             # (holes will be None and will be removed after)
             self.impropers.extend([None] * (i - len(self.impropers)))
-            self.impropers[i - 1] = improper
+        self.impropers[i - 1] = improper
 
     def remove_holes(self):
         """Remove holes (None)."""
@@ -623,6 +703,23 @@ class Data(object):
                 improper for improper in self.impropers if improper is not None
             ]
 
+    def _remove_duplicate_pair_types(self):
+        """Remove duplicate pair types, keep the last one of each."""
+        pair_types = {}
+        for pair_type in self.pair_types:
+            coeffs = pair_type["coeffs"]
+            key = (
+                pair_type["atom_type_1"]["i"],
+                pair_type["atom_type_2"]["i"],
+                tuple(coeffs) if coeffs is not None else None,
+                pair_type["style"],
+                pair_type.get("comment"),
+            )
+            # Move a duplicate at the place of the last one
+            pair_types.pop(key, None)
+            pair_types[key] = pair_type
+        self.pair_types = list(pair_types.values())
+
     def read_from_file(self, filename="lammps.data"):
         """
         Construct LAMMPS Data from file.
@@ -644,455 +741,120 @@ class Data(object):
         nb_dihedral_types = 0
         nb_improper_types = 0
 
-        f = open(filename, "r")
-
-        section = "Header"
-        self.header = f.readline().strip()
-
-        for line in f:
-            line = line.strip()
-
-            if line == "":
-                continue
+        # Parser of Atoms lines, chosen once from the atom style
+        read_atoms_line = {
+            "full": self._read_atoms_full_line,
+            "molecular": self._read_atoms_molecular_line,
+            "charge": self._read_atoms_charge_line,
+        }[self.atom_style]
+
+        # Parser of each section line
+        handlers = {
+            "Masses": self._read_masses_line,
+            "Pair Coeffs": self._read_pair_coeffs_line,
+            "PairIJ Coeffs": self._read_pairij_coeffs_line,
+            "Bond Coeffs": self._read_bond_coeffs_line,
+            "Angle Coeffs": self._read_angle_coeffs_line,
+            "Dihedral Coeffs": self._read_dihedral_coeffs_line,
+            "Improper Coeffs": self._read_improper_coeffs_line,
+            "Atoms": read_atoms_line,
+            "Velocities": self._read_velocities_line,
+            "Bonds": self._read_bonds_line,
+            "Angles": self._read_angles_line,
+            "Dihedrals": self._read_dihedrals_line,
+            "Impropers": self._read_impropers_line,
+        }
 
-            # Comment
-            comment = None
-            if "#" in line:
-                comment = line.split("#")[1].strip()
+        # Larger buffer, the file is read line by line
+        with open(filename, "r", buffering=READ_BUFFER_SIZE) as f:
+            section = "Header"
+            self.header = f.readline().strip()
 
-            # Section change
-            keyword = line.split("#")[0].strip()
-            if (
-                keyword == "Masses"
-                or keyword == "Pair Coeffs"
-                or keyword == "PairIJ Coeffs"
-                or keyword == "Bond Coeffs"
-                or keyword == "Angle Coeffs"
-                or keyword == "Dihedral Coeffs"
-                or keyword == "Improper Coeffs"
-                or keyword == "Atoms"
-                or keyword == "Velocities"
-                or keyword == "Bonds"
-                or keyword == "Angles"
-                or keyword == "Dihedrals"
-                or keyword == "Impropers"
-            ):
-                section = keyword
-                section_comment = comment
-                continue
-
-            # Header
-            if section == "Header":
-                if "atoms" in line:
-                    nb_atoms = int(line.split()[0])
-                    self.atoms = [None] * nb_atoms
-                    continue
-                if "bonds" in line:
-                    nb_bonds = int(line.split()[0])
-                    self.bonds = [None] * nb_bonds
-                    continue
-                if "angles" in line:
-                    nb_angles = int(line.split()[0])
-                    self.angles = [None] * nb_angles
-                    continue
-                if "dihedrals" in line:
-                    nb_dihedrals = int(line.split()[0])
-                    self.dihedrals = [None] * nb_dihedrals
-                    continue
-                if "impropers" in line:
-                    nb_impropers = int(line.split()[0])
-                    self.impropers = [None] * nb_impropers
+            for line in f:
+                # Blank line, other lines are stripped piece by piece below
+                if line.isspace():
                     continue
 
-                if "atom types" in line:
-                    nb_atom_types = int(line.split()[0])
-                    continue
-                if "bond types" in line:
-                    nb_bond_types = int(line.split()[0])
-                    continue
-                if "angle types" in line:
-                    nb_angle_types = int(line.split()[0])
-                    continue
-                if "dihedral types" in line:
-                    nb_dihedral_types = int(line.split()[0])
-                    continue
-                if "improper types" in line:
-                    nb_improper_types = int(line.split()[0])
-                    continue
+                # Split off the comment once
+                parts = line.split("#", 2)
 
-                if "xlo xhi" in line:
-                    self.box[0] = (float(line.split()[0]), float(line.split()[1]))
-                    continue
-                if "ylo yhi" in line:
-                    self.box[1] = (float(line.split()[0]), float(line.split()[1]))
-                    continue
-                if "zlo zhi" in line:
-                    self.box[2] = (float(line.split()[0]), float(line.split()[1]))
-                    continue
-                if "xy xz yz" in line:
-                    self.tilt = [
-                        float(line.split()[0]),
-                        float(line.split()[1]),
-                        float(line.split()[2]),
-                    ]
+                # Comment, the same comments are repeated over many lines
+                comment = None
+                if len(parts) > 1:
+                    comment = sys.intern(parts[1].strip())
+
+                # Section change
+                keyword = parts[0].strip()
+                if keyword in section_keywords:
+                    section = keyword
+                    section_comment = comment
+                    handler = handlers[section]
                     continue
 
-            # Masses
-            if section == "Masses":
-                i = int(line.split()[0])
-                mass = float(line.split()[1])
+                # Split once, values do not contain the comment
+                values = keyword.split()
 
-                self.add_atom_type(i=i, mass=mass, comment=comment)
-
-            # Pair Coeffs
-            if section == "Pair Coeffs":
-                i = int(line.split()[0])
-                # Get all float coeffs
-                coeffs = []
-                # Style can be a string at the first place
-                style = None
-                for c in line.split("#")[0].split()[1:]:
-                    if c == "?":
+                # Header
+                if section == "Header":
+                    if "atoms" in line:
+                        nb_atoms = int(values[0])
+                        self.atoms = [None] * nb_atoms
                         continue
-                    try:
-                        coeff = float(c)
-                        coeffs.append(coeff)
-                    except ValueError:
-                        style = c
-                # Style can be defined once in the section header
-                if style is None and section_comment is not None:
-                    style = section_comment
-
-                self.add_pair_type((i, i), coeffs=coeffs, style=style, comment=comment)
-
-            # PairIJ Coeffs
-            if section == "PairIJ Coeffs":
-                i = int(line.split()[0])
-                j = int(line.split()[1])
-                # Get all float coeffs
-                coeffs = []
-                # Style can be a string at the first place
-                style = None
-                for c in line.split("#")[0].split()[2:]:
-                    if c == "?":
+                    if "bonds" in line:
+                        nb_bonds = int(values[0])
+                        self.bonds = [None] * nb_bonds
                         continue
-                    try:
-                        coeff = float(c)
-                        coeffs.append(coeff)
-                    except ValueError:
-                        style = c
-                # Style can be defined once in the section header
-                if style is None and section_comment is not None:
-                    style = section_comment
-
-                self.add_pair_type((i, j), coeffs=coeffs, style=style, comment=comment)
-
-            # Bond Coeffs
-            if section == "Bond Coeffs":
-                i = int(line.split()[0])
-                # Get all float coeffs
-                coeffs = []
-                # Style can be a string at the first place
-                style = None
-                for c in line.split("#")[0].split()[1:]:
-                    if c == "?":
+                    if "angles" in line:
+                        nb_angles = int(values[0])
+                        self.angles = [None] * nb_angles
                         continue
-                    try:
-                        coeff = float(c)
-                        coeffs.append(coeff)
-                    except ValueError:
-                        style = c
-                # Style can be defined once in the section header
-                if style is None and section_comment is not None:
-                    style = section_comment
-
-                self.add_bond_type(i=i, coeffs=coeffs, style=style, comment=comment)
-
-            # Angle Coeffs
-            if section == "Angle Coeffs":
-                i = int(line.split()[0])
-                # Get all float coeffs
-                coeffs = []
-                # Style can be a string at the first place
-                style = None
-                for c in line.split("#")[0].split()[1:]:
-                    if c == "?":
+                    if "dihedrals" in line:
+                        nb_dihedrals = int(values[0])
+                        self.dihedrals = [None] * nb_dihedrals
+                        continue
+                    if "impropers" in line:
+                        nb_impropers = int(values[0])
+                        self.impropers = [None] * nb_impropers
                         continue
-                    try:
-                        coeff = float(c)
-                        coeffs.append(coeff)
-                    except ValueError:
-                        style = c
-                # Style can be defined once in the section header
-                if style is None and section_comment is not None:
-                    style = section_comment
-
-                self.add_angle_type(i=i, coeffs=coeffs, style=style, comment=comment)
 
-            # Dihedral Coeffs
-            if section == "Dihedral Coeffs":
-                i = int(line.split()[0])
-                # Get all float coeffs
-                coeffs = []
-                # Style can be a string at the first place
-                style = None
-                for c in line.split("#")[0].split()[1:]:
-                    if c == "?":
+                    if "atom types" in line:
+                        nb_atom_types = int(values[0])
                         continue
-                    # Some dihedral coeffs should be keep as int
-                    try:
-                        coeff = int(c)
-                        coeffs.append(coeff)
-                    except ValueError:
-                        try:
-                            coeff = float(c)
-                            coeffs.append(coeff)
-                        except ValueError:
-                            style = c
-                # Style can be defined once in the section header
-                if style is None and section_comment is not None:
-                    style = section_comment
-
-                self.add_dihedral_type(i=i, coeffs=coeffs, style=style, comment=comment)
-
-            # Improper Coeffs
-            if section == "Improper Coeffs":
-                i = int(line.split()[0])
-                # Get all float coeffs
-                coeffs = []
-                # Style can be a string at the first place
-                style = None
-                for c in line.split("#")[0].split()[1:]:
-                    if c == "?":
+                    if "bond types" in line:
+                        nb_bond_types = int(values[0])
+                        continue
+                    if "angle types" in line:
+                        nb_angle_types = int(values[0])
+                        continue
+                    if "dihedral types" in line:
+                        nb_dihedral_types = int(values[0])
+                        continue
+                    if "improper types" in line:
+                        nb_improper_types = int(values[0])
                         continue
-                    try:
-                        coeff = float(c)
-                        coeffs.append(coeff)
-                    except ValueError:
-                        style = c
-                # Style can be defined once in the section header
-                if style is None and section_comment is not None:
-                    style = section_comment
-
-                self.add_improper_type(i=i, coeffs=coeffs, style=style, comment=comment)
-
-            # Atoms
-            if section == "Atoms":
-                if self.atom_style == "full":
-                    # full = atom-ID molecule-ID atom-type q x y z
-                    atom_type_i = int(line.split()[2])
-                elif self.atom_style == "molecular":
-                    # molecular = atom-ID molecule-ID atom-type q x y z
-                    atom_type_i = int(line.split()[2])
-                elif self.atom_style == "charge":
-                    # charge = atom-ID atom-type q x y z
-                    atom_type_i = int(line.split()[1])
-
-                try:
-                    atom_type = self.atom_types[atom_type_i - 1]
-                    if atom_type is None:
-                        # Masses not available, create empty type
-                        # Atom type comment taken from atom
-                        self.add_atom_type(i=atom_type_i, comment=comment)
-                        atom_type = self.atom_types[atom_type_i - 1]
-                except IndexError:
-                    # Masses not available, create empty type
-                    # Atom type comment taken from atom
-                    self.add_atom_type(i=atom_type_i, comment=comment)
-                    atom_type = self.atom_types[atom_type_i - 1]
-
-                if self.atom_style == "full":
-                    # full = atom-ID molecule-ID atom-type q x y z
-                    try:
-                        nx = int(line.split()[7])
-                        ny = int(line.split()[8])
-                        nz = int(line.split()[9])
-                    except (IndexError, ValueError):
-                        nx = None
-                        ny = None
-                        nz = None
-                    self.add_atom(
-                        i=int(line.split()[0]),
-                        mol_i=int(line.split()[1]),
-                        atom_type=atom_type,
-                        charge=float(line.split()[3]),
-                        x=float(line.split()[4]),
-                        y=float(line.split()[5]),
-                        z=float(line.split()[6]),
-                        nx=nx,
-                        ny=ny,
-                        nz=nz,
-                        comment=comment,
-                    )
-                elif self.atom_style == "molecular":
-                    # molecular = atom-ID molecule-ID atom-type x y z
-                    try:
-                        nx = int(line.split()[6])
-                        ny = int(line.split()[7])
-                        nz = int(line.split()[8])
-                    except (IndexError, ValueError):
-                        nx = None
-                        ny = None
-                        nz = None
-                    self.add_atom(
-                        i=int(line.split()[0]),
-                        mol_i=int(line.split()[1]),
-                        atom_type=atom_type,
-                        x=float(line.split()[3]),
-                        y=float(line.split()[4]),
-                        z=float(line.split()[5]),
-                        nx=nx,
-                        ny=ny,
-                        nz=nz,
-                        comment=comment,
-                    )
-                elif self.atom_style == "charge":
-                    # charge = atom-ID atom-type q x y z
-                    try:
-                        nx = int(line.split()[6])
-                        ny = int(line.split()[7])
-                        nz = int(line.split()[8])
-                    except (IndexError, ValueError):
-                        nx = None
-                        ny = None
-                        nz = None
-                    self.add_atom(
-                        i=int(line.split()[0]),
-                        atom_type=atom_type,
-                        charge=float(line.split()[2]),
-                        x=float(line.split()[3]),
-                        y=float(line.split()[4]),
-                        z=float(line.split()[5]),
-                        nx=nx,
-                        ny=ny,
-                        nz=nz,
-                        comment=comment,
-                    )
-
-            # Velocities
-            if section == "Velocities":
-                i = int(line.split()[0])
-                vx = float(line.split()[1])
-                vy = float(line.split()[2])
-                vz = float(line.split()[3])
-                self.atoms[i - 1]["vx"] = vx
-                self.atoms[i - 1]["vy"] = vy
-                self.atoms[i - 1]["vz"] = vz
-
-            # Bonds
-            if section == "Bonds":
-                i = int(line.split()[0])
-                bond_type_i = int(line.split()[1])
-                atom1_i = int(line.split()[2])
-                atom2_i = int(line.split()[3])
-
-                try:
-                    bond_type = self.bond_types[bond_type_i - 1]
-                    if bond_type is None:
-                        # Coeffs not available, create empty type
-                        # Bond type comment takeBondsn from bond
-                        self.add_bond_type(i=bond_type_i, comment=comment)
-                        bond_type = self.bond_types[bond_type_i - 1]
-                except IndexError:
-                    # Coeffs not available, create empty type
-                    # Bond type comment taken from bond
-                    self.add_bond_type(i=bond_type_i, comment=comment)
-                    bond_type = self.bond_types[bond_type_i - 1]
-
-                self.add_bond(
-                    (atom1_i, atom2_i),
-                    i=i,
-                    bond_type=bond_type,
-                    comment=comment,
-                )
-
-            # Angles
-            if section == "Angles":
-                i = int(line.split()[0])
-                angle_type_i = int(line.split()[1])
-                atom1_i = int(line.split()[2])
-                atom2_i = int(line.split()[3])
-                atom3_i = int(line.split()[4])
-
-                try:
-                    angle_type = self.angle_types[angle_type_i - 1]
-                    if angle_type is None:
-                        # Coeffs not available, create empty type
-                        # Angle type comment taken from angle
-                        self.add_angle_type(i=angle_type_i, comment=comment)
-                        angle_type = self.angle_types[angle_type_i - 1]
-                except IndexError:
-                    # Coeffs not available, create empty type
-                    # Angle type comment taken from angle
-                    self.add_angle_type(i=angle_type_i, comment=comment)
-                    angle_type = self.angle_types[angle_type_i - 1]
-
-                self.add_angle(
-                    (atom1_i, atom2_i, atom3_i),
-                    i=i,
-                    angle_type=angle_type,
-                    comment=comment,
-                )
 
-            # Dihedrals
-            if section == "Dihedrals":
-                i = int(line.split()[0])
-                dihedral_type_i = int(line.split()[1])
-                atom1_i = int(line.split()[2])
-                atom2_i = int(line.split()[3])
-                atom3_i = int(line.split()[4])
-                atom4_i = int(line.split()[5])
-
-                try:
-                    dihedral_type = self.dihedral_types[dihedral_type_i - 1]
-                    if dihedral_type is None:
-                        # Coeffs not available, create empty type
-                        # Dihedral type comment taken from dihedral
-                        self.add_dihedral_type(i=dihedral_type_i, comment=comment)
-                        dihedral_type = self.dihedral_types[dihedral_type_i - 1]
-                except IndexError:
-                    # Coeffs not available, create empty type
-                    # Dihedral type comment taken from dihedral
-                    self.add_dihedral_type(i=dihedral_type_i, comment=comment)
-                    dihedral_type = self.dihedral_types[dihedral_type_i - 1]
-
-                self.add_dihedral(
-                    (atom1_i, atom2_i, atom3_i, atom4_i),
-                    i=i,
-                    dihedral_type=dihedral_type,
-                    comment=comment,
-                )
+                    if "xlo xhi" in line:
+                        self.box[0] = (float(values[0]), float(values[1]))
+                        continue
+                    if "ylo yhi" in line:
+                        self.box[1] = (float(values[0]), float(values[1]))
+                        continue
+                    if "zlo zhi" in line:
+                        self.box[2] = (float(values[0]), float(values[1]))
+                        continue
+                    if "xy xz yz" in line:
+                        self.tilt = [
+                            float(values[0]),
+                            float(values[1]),
+                            float(values[2]),
+                        ]
+                        continue
 
-            # Impropers
-            if section == "Impropers":
-                i = int(line.split()[0])
-                improper_type_i = int(line.split()[1])
-                atom1_i = int(line.split()[2])
-                atom2_i = int(line.split()[3])
-                atom3_i = int(line.split()[4])
-                atom4_i = int(line.split()[5])
-
-                try:
-                    improper_type = self.improper_types[improper_type_i - 1]
-                    if improper_type is None:
-                        # Coeffs not available, create empty type
-                        # Improper type comment taken from improper
-                        self.add_improper_type(i=improper_type_i, comment=comment)
-                        improper_type = self.improper_types[improper_type_i - 1]
-                except IndexError:
-                    # Coeffs not available, create empty type
-                    # Improper type comment taken from improper
-                    self.add_improper_type(i=improper_type_i, comment=comment)
-                    improper_type = self.improper_types[improper_type_i - 1]
-
-                self.add_improper(
-                    (atom1_i, atom2_i, atom3_i, atom4_i),
-                    i=i,
-                    improper_type=improper_type,
-                    comment=comment,
-                )
+                    # Unknown header line
+                    continue
 
-        f.close()
+                # Section line, parsed by the handler of the current section
+                handler(values, comment, section_comment)
 
         # Remove holes (None)
         self.remove_holes()
@@ -1127,6 +889,357 @@ class Data(object):
         if len(self.improper_types) != nb_improper_types:
             raise ValueError("Number of improper types is not coherent")
 
+    def _read_masses_line(self, values, comment, section_comment):
+        """Read a line of the Masses section."""
+        i = int(values[0])
+        mass = float(values[1])
+
+        self.add_atom_type(i=i, mass=mass, comment=comment)
+
+    def _read_pair_coeffs_line(self, values, comment, section_comment):
+        """Read a line of the Pair Coeffs section."""
+        i = int(values[0])
+        # Get all float coeffs
+        coeffs = []
+        # Style can be a string at the first place
+        style = None
+        for c in values[1:]:
+            if c == "?":
+                continue
+            coeff = parse_coeff(c)
+            if isinstance(coeff, str):
+                style = coeff
+            else:
+                coeffs.append(coeff)
+        # Style can be defined once in the section header
+        if style is None and section_comment is not None:
+            style = section_comment
+
+        self.add_pair_type((i, i), coeffs=coeffs, style=style, comment=comment)
+
+    def _read_pairij_coeffs_line(self, values, comment, section_comment):
+        """Read a line of the PairIJ Coeffs section."""
+        i = int(values[0])
+        j = int(values[1])
+        # Get all float coeffs
+        coeffs = []
+        # Style can be a string at the first place
+        style = None
+        for c in values[2:]:
+            if c == "?":
+                continue
+            coeff = parse_coeff(c)
+            if isinstance(coeff, str):
+                style = coeff
+            else:
+                coeffs.append(coeff)
+        # Style can be defined once in the section header
+        if style is None and section_comment is not None:
+            style = section_comment
+
+        self.add_pair_type((i, j), coeffs=coeffs, style=style, comment=comment)
+
+    def _read_bond_coeffs_line(self, values, comment, section_comment):
+        """Read a line of the Bond Coeffs section."""
+        i = int(values[0])
+        # Get all float coeffs
+        coeffs = []
+        # Style can be a string at the first place
+        style = None
+        for c in values[1:]:
+            if c == "?":
+                continue
+            coeff = parse_coeff(c)
+            if isinstance(coeff, str):
+                style = coeff
+            else:
+                coeffs.append(coeff)
+        # Style can be defined once in the section header
+        if style is None and section_comment is not None:
+            style = section_comment
+
+        self.add_bond_type(i=i, coeffs=coeffs, style=style, comment=comment)
+
+    def _read_angle_coeffs_line(self, values, comment, section_comment):
+        """Read a line of the Angle Coeffs section."""
+        i = int(values[0])
+        # Get all float coeffs
+        coeffs = []
+        # Style can be a string at the first place
+        style = None
+        for c in values[1:]:
+            if c == "?":
+                continue
+            coeff = parse_coeff(c)
+            if isinstance(coeff, str):
+                style = coeff
+            else:
+                coeffs.append(coeff)
+        # Style can be defined once in the section header
+        if style is None and section_comment is not None:
+            style = section_comment
+
+        self.add_angle_type(i=i, coeffs=coeffs, style=style, comment=comment)
+
+    def _read_dihedral_coeffs_line(self, values, comment, section_comment):
+        """Read a line of the Dihedral Coeffs section."""
+        i = int(values[0])
+        # Get all float coeffs
+        coeffs = []
+        # Style can be a string at the first place
+        style = None
+        for c in values[1:]:
+            if c == "?":
+                continue
+            # Some dihedral coeffs should be keep as int
+            coeff = parse_coeff(c, keep_int=True)
+            if isinstance(coeff, str):
+                style = coeff
+            else:
+                coeffs.append(coeff)
+        # Style can be defined once in the section header
+        if style is None and section_comment is not None:
+            style = section_comment
+
+        self.add_dihedral_type(i=i, coeffs=coeffs, style=style, comment=comment)
+
+    def _read_improper_coeffs_line(self, values, comment, section_comment):
+        """Read a line of the Improper Coeffs section."""
+        i = int(values[0])
+        # Get all float coeffs
+        coeffs = []
+        # Style can be a string at the first place
+        style = None
+        for c in values[1:]:
+            if c == "?":
+                continue
+            coeff = parse_coeff(c)
+            if isinstance(coeff, str):
+                style = coeff
+            else:
+                coeffs.append(coeff)
+        # Style can be defined once in the section header
+        if style is None and section_comment is not None:
+            style = section_comment
+
+        self.add_improper_type(i=i, coeffs=coeffs, style=style, comment=comment)
+
+    def _get_atom_type(self, atom_type_i, comment):
+        """Return an atom type, create it if Masses are not available."""
+        try:
+            atom_type = self.atom_types[atom_type_i - 1]
+            if atom_type is None:
+                # Masses not available, create empty type
+                # Atom type comment taken from atom
+                self.add_atom_type(i=atom_type_i, comment=comment)
+                atom_type = self.atom_types[atom_type_i - 1]
+        except IndexError:
+            # Masses not available, create empty type
+            # Atom type comment taken from atom
+            self.add_atom_type(i=atom_type_i, comment=comment)
+            atom_type = self.atom_types[atom_type_i - 1]
+
+        return atom_type
+
+    def _read_atoms_full_line(self, values, comment, section_comment):
+        """Read a line of the Atoms section, full atom style."""
+        # full = atom-ID molecule-ID atom-type q x y z
+        atom_type = self._get_atom_type(int(values[2]), comment)
+        try:
+            nx = int(values[7])
+            ny = int(values[8])
+            nz = int(values[9])
+        except (IndexError, ValueError):
+            nx = None
+            ny = None
+            nz = None
+        self.add_atom(
+            i=int(values[0]),
+            mol_i=int(values[1]),
+            atom_type=atom_type,
+            charge=float(values[3]),
+            x=float(values[4]),
+            y=float(values[5]),
+            z=float(values[6]),
+            nx=nx,
+            ny=ny,
+            nz=nz,
+            comment=comment,
+        )
+
+    def _read_atoms_molecular_line(self, values, comment, section_comment):
+        """Read a line of the Atoms section, molecular atom style."""
+        # molecular = atom-ID molecule-ID atom-type x y z
+        atom_type = self._get_atom_type(int(values[2]), comment)
+        try:
+            nx = int(values[6])
+            ny = int(values[7])
+            nz = int(values[8])
+        except (IndexError, ValueError):
+            nx = None
+            ny = None
+            nz = None
+        self.add_atom(
+            i=int(values[0]),
+            mol_i=int(values[1]),
+            atom_type=atom_type,
+            x=float(values[3]),
+            y=float(values[4]),
+            z=float(values[5]),
+            nx=nx,
+            ny=ny,
+            nz=nz,
+            comment=comment,
+        )
+
+    def _read_atoms_charge_line(self, values, comment, section_comment):
+        """Read a line of the Atoms section, charge atom style."""
+        # charge = atom-ID atom-type q x y z
+        atom_type = self._get_atom_type(int(values[1]), comment)
+        try:
+            nx = int(values[6])
+            ny = int(values[7])
+            nz = int(values[8])
+        except (IndexError, ValueError):
+            nx = None
+            ny = None
+            nz = None
+        self.add_atom(
+            i=int(values[0]),
+            atom_type=atom_type,
+            charge=float(values[2]),
+            x=float(values[3]),
+            y=float(values[4]),
+            z=float(values[5]),
+            nx=nx,
+            ny=ny,
+            nz=nz,
+            comment=comment,
+        )
+
+    def _read_velocities_line(self, values, comment, section_comment):
+        """Read a line of the Velocities section."""
+        i = int(values[0])
+        vx = float(values[1])
+        vy = float(values[2])
+        vz = float(values[3])
+        self.atoms[i - 1]["vx"] = vx
+        self.atoms[i - 1]["vy"] = vy
+        self.atoms[i - 1]["vz"] = vz
+
+    def _read_bonds_line(self, values, comment, section_comment):
+        """Read a line of the Bonds section."""
+        i = int(values[0])
+        bond_type_i = int(values[1])
+        atom1_i = int(values[2])
+        atom2_i = int(values[3])
+
+        try:
+            bond_type = self.bond_types[bond_type_i - 1]
+            if bond_type is None:
+                # Coeffs not available, create empty type
+                # Bond type comment takeBondsn from bond
+                self.add_bond_type(i=bond_type_i, comment=comment)
+                bond_type = self.bond_types[bond_type_i - 1]
+        except IndexError:
+            # Coeffs not available, create empty type
+            # Bond type comment taken from bond
+            self.add_bond_type(i=bond_type_i, comment=comment)
+            bond_type = self.bond_types[bond_type_i - 1]
+
+        self.add_bond(
+            (atom1_i, atom2_i),
+            i=i,
+            bond_type=bond_type,
+            comment=comment,
+        )
+
+    def _read_angles_line(self, values, comment, section_comment):
+        """Read a line of the Angles section."""
+        i = int(values[0])
+        angle_type_i = int(values[1])
+        atom1_i = int(values[2])
+        atom2_i = int(values[3])
+        atom3_i = int(values[4])
+
+        try:
+            angle_type = self.angle_types[angle_type_i - 1]
+            if angle_type is None:
+                # Coeffs not available, create empty type
+                # Angle type comment taken from angle
+                self.add_angle_type(i=angle_type_i, comment=comment)
+                angle_type = self.angle_types[angle_type_i - 1]
+        except IndexError:
+            # Coeffs not available, create empty type
+            # Angle type comment taken from angle
+            self.add_angle_type(i=angle_type_i, comment=comment)
+            angle_type = self.angle_types[angle_type_i - 1]
+
+        self.add_angle(
+            (atom1_i, atom2_i, atom3_i),
+            i=i,
+            angle_type=angle_type,
+            comment=comment,
+        )
+
+    def _read_dihedrals_line(self, values, comment, section_comment):
+        """Read a line of the Dihedrals section."""
+        i = int(values[0])
+        dihedral_type_i = int(values[1])
+        atom1_i = int(values[2])
+        atom2_i = int(values[3])
+        atom3_i = int(values[4])
+        atom4_i = int(values[5])
+
+        try:
+            dihedral_type = self.dihedral_types[dihedral_type_i - 1]
+            if dihedral_type is None:
+                # Coeffs not available, create empty type
+                # Dihedral type comment taken from dihedral
+                self.add_dihedral_type(i=dihedral_type_i, comment=comment)
+                dihedral_type = self.dihedral_types[dihedral_type_i - 1]
+        except IndexError:
+            # Coeffs not available, create empty type
+            # Dihedral type comment taken from dihedral
+            self.add_dihedral_type(i=dihedral_type_i, comment=comment)
+            dihedral_type = self.dihedral_types[dihedral_type_i - 1]
+
+        self.add_dihedral(
+            (atom1_i, atom2_i, atom3_i, atom4_i),
+            i=i,
+            dihedral_type=dihedral_type,
+            comment=comment,
+        )
+
+    def _read_impropers_line(self, values, comment, section_comment):
+        """Read a line of the Impropers section."""
+        i = int(values[0])
+        improper_type_i = int(values[1])
+        atom1_i = int(values[2])
+        atom2_i = int(values[3])
+        atom3_i = int(values[4])
+        atom4_i = int(values[5])
+
+        try:
+            improper_type = self.improper_types[improper_type_i - 1]
+            if improper_type is None:
+                # Coeffs not available, create empty type
+                # Improper type comment taken from improper
+                self.add_improper_type(i=improper_type_i, comment=comment)
+                improper_type = self.improper_types[improper_type_i - 1]
+        except IndexError:
+            # Coeffs not available, create empty type
+            # Improper type comment taken from improper
+            self.add_improper_type(i=improper_type_i, comment=comment)
+            improper_type = self.improper_types[improper_type_i - 1]
+
+        self.add_improper(
+            (atom1_i, atom2_i, atom3_i, atom4_i),
+            i=i,
+            improper_type=improper_type,
+            comment=comment,
+        )
+
     def read_pair_coeffs_from_file(self, filename="pair.coeffs"):
         """
         Read pair coefficients from a LAMMPS input file.
@@ -1139,56 +1252,53 @@ class Data(object):
         nb_atom_types = len(self.atom_types)
         self.pair_types = []
 
-        f = open(filename, "r")
+        with open(filename, "r") as f:
+            for line in f:
+                line = line.strip()
 
-        for line in f:
-            line = line.strip()
+                if line == "":
+                    continue
 
-            if line == "":
-                continue
+                if not line.startswith("pair_coeff"):
+                    continue
 
-            if not line.startswith("pair_coeff"):
-                continue
+                # Split off the comment once
+                parts = line.split("#", 2)
+                values = parts[0].split()
 
-            # Expand indices, if using wild-cards
-            ids_i = expand_ids(line.split()[1], nb_atom_types)
-            ids_j = expand_ids(line.split()[2], nb_atom_types)
-            for i, j in itertools.product(ids_i, ids_j):
                 # Get all float coeffs
                 coeffs = []
                 # Style can be a string at the first place
                 style = None
-                for c in line.split("#")[0].split()[3:]:
+                for c in values[3:]:
                     if c == "?":
                         continue
-                    try:
-                        coeff = float(c)
+                    coeff = parse_coeff(c)
+                    if isinstance(coeff, str):
+                        style = coeff
+                    else:
                         coeffs.append(coeff)
-                    except ValueError:
-                        style = c
                 # Comment
                 comment = None
-                if "#" in line:
-                    comment = line.split("#")[1].strip()
-
-                # Order atom types
-                if i <= j:
-                    self.add_pair_type(
-                        (i, j), coeffs=coeffs, style=style, comment=comment
-                    )
-                else:
-                    self.add_pair_type(
-                        (j, i), coeffs=coeffs, style=style, comment=comment
-                    )
-
-        f.close()
+                if len(parts) > 1:
+                    comment = parts[1].strip()
+
+                # Expand indices, if using wild-cards, each pair gets its own coeffs
+                ids_i = expand_ids(values[1], nb_atom_types)
+                ids_j = expand_ids(values[2], nb_atom_types)
+                for i, j in itertools.product(ids_i, ids_j):
+                    # Order atom types
+                    if i <= j:
+                        self.add_pair_type(
+                            (i, j), coeffs=list(coeffs), style=style, comment=comment
+                        )
+                    else:
+                        self.add_pair_type(
+                            (j, i), coeffs=list(coeffs), style=style, comment=comment
+                        )
 
         # Remove duplicates
-        self.pair_types = [
-            pair_type
-            for n, pair_type in enumerate(self.pair_types)
-            if pair_type not in self.pair_types[n + 1 :]
-        ]
+        self._remove_duplicate_pair_types()
 
         # Sort pair types by first atom type then by second atom type
         self.pair_types.sort(
@@ -1210,40 +1320,42 @@ class Data(object):
         nb_bond_types = len(self.bond_types)
         self.bond_types = []
 
-        f = open(filename, "r")
+        with open(filename, "r") as f:
+            for line in f:
+                line = line.strip()
 
-        for line in f:
-            line = line.strip()
+                if line == "":
+                    continue
 
-            if line == "":
-                continue
+                if not line.startswith("bond_coeff"):
+                    continue
 
-            if not line.startswith("bond_coeff"):
-                continue
+                # Split off the comment once
+                parts = line.split("#", 2)
+                values = parts[0].split()
 
-            # Expand indices, if using wild-cards
-            ids = expand_ids(line.split()[1], nb_bond_types)
-            for i in ids:
                 # Get all float coeffs
                 coeffs = []
                 # Style can be a string at the first place
                 style = None
-                for c in line.split("#")[0].split()[2:]:
+                for c in values[2:]:
                     if c == "?":
                         continue
-                    try:
-                        coeff = float(c)
+                    coeff = parse_coeff(c)
+                    if isinstance(coeff, str):
+                        style = coeff
+                    else:
                         coeffs.append(coeff)
-                    except ValueError:
-                        style = c
                 # Comment
                 comment = None
-                if "#" in line:
-                    comment = line.split("#")[1].strip()
-
-                self.add_bond_type(i=i, coeffs=coeffs, style=style, comment=comment)
+                if len(parts) > 1:
+                    comment = parts[1].strip()
 
-        f.close()
+                # Expand indices, if using wild-cards, each type gets its own coeffs
+                for i in expand_ids(values[1], nb_bond_types):
+                    self.add_bond_type(
+                        i=i, coeffs=list(coeffs), style=style, comment=comment
+                    )
 
         # Do not forget to update bonds
         for bond in self.bonds:
@@ -1268,40 +1380,42 @@ class Data(object):
         nb_angle_types = len(self.angle_types)
         self.angle_types = []
 
-        f = open(filename, "r")
+        with open(filename, "r") as f:
+            for line in f:
+                line = line.strip()
 
-        for line in f:
-            line = line.strip()
+                if line == "":
+                    continue
 
-            if line == "":
-                continue
+                if not line.startswith("angle_coeff"):
+                    continue
 
-            if not line.startswith("angle_coeff"):
-                continue
+                # Split off the comment once
+                parts = line.split("#", 2)
+                values = parts[0].split()
 
-            # Expand indices, if using wild-cards
-            ids = expand_ids(line.split()[1], nb_angle_types)
-            for i in ids:
                 # Get all float coeffs
                 coeffs = []
                 # Style can be a string at the first place
                 style = None
-                for c in line.split("#")[0].split()[2:]:
+                for c in values[2:]:
                     if c == "?":
                         continue
-                    try:
-                        coeff = float(c)
+                    coeff = parse_coeff(c)
+                    if isinstance(coeff, str):
+                        style = coeff
+                    else:
                         coeffs.append(coeff)
-                    except ValueError:
-                        style = c
                 # Comment
                 comment = None
-                if "#" in line:
-                    comment = line.split("#")[1].strip()
-
-                self.add_angle_type(i=i, coeffs=coeffs, style=style, comment=comment)
+                if len(parts) > 1:
+                    comment = parts[1].strip()
 
-        f.close()
+                # Expand indices, if using wild-cards, each type gets its own coeffs
+                for i in expand_ids(values[1], nb_angle_types):
+                    self.add_angle_type(
+                        i=i, coeffs=list(coeffs), style=style, comment=comment
+                    )
 
         # Do not forget to update angles
         for angle in self.angles:
@@ -1326,45 +1440,43 @@ class Data(object):
         nb_dihedral_types = len(self.dihedral_types)
         self.dihedral_types = []
 
-        f = open(filename, "r")
+        with open(filename, "r") as f:
+            for line in f:
+                line = line.strip()
 
-        for line in f:
-            line = line.strip()
+                if line == "":
+                    continue
 
-            if line == "":
-                continue
+                if not line.startswith("dihedral_coeff"):
+                    continue
 
-            if not line.startswith("dihedral_coeff"):
-                continue
+                # Split off the comment once
+                parts = line.split("#", 2)
+                values = parts[0].split()
 
-            # Expand indices, if using wild-cards
-            ids = expand_ids(line.split()[1], nb_dihedral_types)
-            for i in ids:
                 # Get all float coeffs
                 coeffs = []
                 # Style can be a string at the first place
                 style = None
-                for c in line.split("#")[0].split()[2:]:
+                for c in values[2:]:
                     if c == "?":
                         continue
                     # Some dihedral coeffs should be keep as int
-                    try:
-                        coeff = int(c)
+                    coeff = parse_coeff(c, keep_int=True)
+                    if isinstance(coeff, str):
+                        style = coeff
+                    else:
                         coeffs.append(coeff)
-                    except ValueError:
-                        try:
-                            coeff = float(c)
-                            coeffs.append(coeff)
-                        except ValueError:
-                            style = c
                 # Comment
                 comment = None
-                if "#" in line:
-                    comment = line.split("#")[1].strip()
+                if len(parts) > 1:
+                    comment = parts[1].strip()
 
-                self.add_dihedral_type(i=i, coeffs=coeffs, style=style, comment=comment)
-
-        f.close()
+                # Expand indices, if using wild-cards, each type gets its own coeffs
+                for i in expand_ids(values[1], nb_dihedral_types):
+                    self.add_dihedral_type(
+                        i=i, coeffs=list(coeffs), style=style, comment=comment
+                    )
 
         # Do not forget to update dihedrals
         for dihedral in self.dihedrals:
@@ -1391,40 +1503,42 @@ class Data(object):
         nb_improper_types = len(self.improper_types)
         self.improper_types = []
 
-        f = open(filename, "r")
+        with open(filename, "r") as f:
+            for line in f:
+                line = line.strip()
 
-        for line in f:
-            line = line.strip()
+                if line == "":
+                    continue
 
-            if line == "":
-                continue
+                if not line.startswith("improper_coeff"):
+                    continue
 
-            if not line.startswith("improper_coeff"):
-                continue
+                # Split off the comment once
+                parts = line.split("#", 2)
+                values = parts[0].split()
 
-            # Expand indices, if using wild-cards
-            ids = expand_ids(line.split()[1], nb_improper_types)
-            for i in ids:
                 # Get all float coeffs
                 coeffs = []
                 # Style can be a string at the first place
                 style = None
-                for c in line.split("#")[0].split()[2:]:
+                for c in values[2:]:
                     if c == "?":
                         continue
-                    try:
-                        coeff = float(c)
+                    coeff = parse_coeff(c)
+                    if isinstance(coeff, str):
+                        style = coeff
+                    else:
                         coeffs.append(coeff)
-                    except ValueError:
-                        style = c
                 # Comment
                 comment = None
-                if "#" in line:
-                    comment = line.split("#")[1].strip()
-
-                self.add_improper_type(i=i, coeffs=coeffs, style=style, comment=comment)
+                if len(parts) > 1:
+                    comment = parts[1].strip()
 
-        f.close()
+                # Expand indices, if using wild-cards, each type gets its own coeffs
+                for i in expand_ids(values[1], nb_improper_types):
+                    self.add_improper_type(
+                        i=i, coeffs=list(coeffs), style=style, comment=comment
+                    )
 
         # Do not forget to update impropers
         for improper in self.impropers:
@@ -1450,291 +1564,326 @@ class Data(object):
         write_coeffs : bool, default 'False'
             Include force field information ?
         """
-        f = open(filename, "w")
-
-        # Header
-        f.write("{:s}\n\n".format(self.header))
-        f.write("{:d} atoms\n".format(len(self.atoms)))
-        if len(self.bonds) > 0:
-            f.write("{:d} bonds\n".format(len(self.bonds)))
-        if len(self.angles) > 0:
-            f.write("{:d} angles\n".format(len(self.angles)))
-        if len(self.dihedrals) > 0:
-            f.write("{:d} dihedrals\n".format(len(self.dihedrals)))
-        if len(self.impropers) > 0:
-            f.write("{:d} impropers\n".format(len(self.impropers)))
-        f.write("\n")
-
-        f.write("{:d} atom types\n".format(len(self.atom_types)))
-        if len(self.bond_types) > 0:
-            f.write("{:d} bond types\n".format(len(self.bond_types)))
-        if len(self.angle_types) > 0:
-            f.write("{:d} angle types\n".format(len(self.angle_types)))
-        if len(self.dihedral_types) > 0:
-            f.write("{:d} dihedral types\n".format(len(self.dihedral_types)))
-        if len(self.improper_types) > 0:
-            f.write("{:d} improper types\n".format(len(self.improper_types)))
-        f.write("\n")
-
-        f.write("{:f} {:f} xlo xhi\n".format(*self.box[0]))
-        f.write("{:f} {:f} ylo yhi\n".format(*self.box[1]))
-        f.write("{:f} {:f} zlo zhi\n".format(*self.box[2]))
-        if self.tilt != [0.0, 0.0, 0.0]:
-            f.write("{:f} {:f} {:f} xy xz yz\n".format(*self.tilt))
-        f.write("\n")
-
-        # Masses
-        if self.atom_types != []:
-            f.write("Masses\n\n")
-            for atom_type in self.atom_types:
-                f.write("{:4d} {:9.6f}".format(atom_type["i"], atom_type["mass"]))
-                write_comment(f, atom_type)
+        with open(filename, "w") as f:
+            # Header
+            f.write("{:s}\n\n".format(self.header))
+            f.write("{:d} atoms\n".format(len(self.atoms)))
+            if len(self.bonds) > 0:
+                f.write("{:d} bonds\n".format(len(self.bonds)))
+            if len(self.angles) > 0:
+                f.write("{:d} angles\n".format(len(self.angles)))
+            if len(self.dihedrals) > 0:
+                f.write("{:d} dihedrals\n".format(len(self.dihedrals)))
+            if len(self.impropers) > 0:
+                f.write("{:d} impropers\n".format(len(self.impropers)))
             f.write("\n")
 
-        # Coeffs
-        if write_coeffs:
-
-            # Pair Coeffs
-            if [
-                pair_type
-                for pair_type in self.pair_types
-                if pair_type["atom_type_1"]["i"] == pair_type["atom_type_2"]["i"]
-            ] != []:
-                f.write("Pair Coeffs")
-                nb_styles = len({d["style"] for d in self.pair_types})
-                if nb_styles == 1:
-                    style = self.pair_types[0]["style"]
-                    if style is not None:
-                        f.write(" # {:s}".format(style))
-                f.write("\n\n")
-
-                for pair_type in self.pair_types:
-                    if pair_type["atom_type_1"]["i"] != pair_type["atom_type_2"]["i"]:
-                        continue
-                    f.write("{:4d}".format(pair_type["atom_type_1"]["i"]))
-                    if nb_styles > 1:
-                        f.write(" {:7s}".format(pair_type["style"]))
-                    if pair_type["coeffs"] is not None:
-                        for coeff in pair_type["coeffs"]:
-                            f.write(" {:9.4f}".format(coeff))
-                    write_comment(f, pair_type)
-                f.write("\n")
+            f.write("{:d} atom types\n".format(len(self.atom_types)))
+            if len(self.bond_types) > 0:
+                f.write("{:d} bond types\n".format(len(self.bond_types)))
+            if len(self.angle_types) > 0:
+                f.write("{:d} angle types\n".format(len(self.angle_types)))
+            if len(self.dihedral_types) > 0:
+                f.write("{:d} dihedral types\n".format(len(self.dihedral_types)))
+            if len(self.improper_types) > 0:
+                f.write("{:d} improper types\n".format(len(self.improper_types)))
+            f.write("\n")
 
-            # PairIJ Coeffs
-            if [
-                pair_type
-                for pair_type in self.pair_types
-                if pair_type["atom_type_1"]["i"] != pair_type["atom_type_2"]["i"]
-            ] != []:
-                f.write("PairIJ Coeffs")
-                nb_styles = len({d["style"] for d in self.pair_types})
-                if nb_styles == 1:
-                    style = self.pair_types[0]["style"]
-                    if style is not None:
-                        f.write(" # {:s}".format(style))
-                f.write("\n\n")
-
-                for pair_type in self.pair_types:
-                    if pair_type["atom_type_1"]["i"] == pair_type["atom_type_2"]["i"]:
-                        continue
-                    f.write(
-                        "{:4d} {:4d}".format(
-                            pair_type["atom_type_1"]["i"], pair_type["atom_type_2"]["i"]
-                        )
-                    )
-                    if nb_styles > 1:
-                        f.write(" {:7s}".format(pair_type["style"]))
-                    if pair_type["coeffs"] is not None:
-                        for coeff in pair_type["coeffs"]:
-                            f.write(" {:9.4f}".format(coeff))
-                    write_comment(f, pair_type)
-                f.write("\n")
+            f.write("{:f} {:f} xlo xhi\n".format(*self.box[0]))
+            f.write("{:f} {:f} ylo yhi\n".format(*self.box[1]))
+            f.write("{:f} {:f} zlo zhi\n".format(*self.box[2]))
+            if self.tilt != [0.0, 0.0, 0.0]:
+                f.write("{:f} {:f} {:f} xy xz yz\n".format(*self.tilt))
+            f.write("\n")
 
-            # Bond Coeffs
-            if self.bond_types != []:
-                f.write("Bond Coeffs")
-                nb_styles = len({d["style"] for d in self.bond_types})
-                if nb_styles == 1:
-                    style = self.bond_types[0]["style"]
-                    if style is not None:
-                        f.write(" # {:s}".format(style))
-                f.write("\n\n")
-
-                for bond_type in self.bond_types:
-                    f.write("{:4d}".format(bond_type["i"]))
-                    if nb_styles > 1:
-                        f.write(" {:7s}".format(bond_type["style"]))
-                    if bond_type["coeffs"] is not None:
-                        for coeff in bond_type["coeffs"]:
-                            f.write(" {:9.4f}".format(coeff))
-                    write_comment(f, bond_type)
+            # Masses
+            if self.atom_types != []:
+                f.write("Masses\n\n")
+                for atom_type in self.atom_types:
+                    f.write("{:4d} {:9.6f}".format(atom_type["i"], atom_type["mass"]))
+                    write_comment(f, atom_type)
                 f.write("\n")
 
-            # Angle Coeffs
-            if self.angle_types != []:
-                f.write("Angle Coeffs")
-                nb_styles = len({d["style"] for d in self.angle_types})
-                if nb_styles == 1:
-                    style = self.angle_types[0]["style"]
-                    if style is not None:
-                        f.write(" # {:s}".format(style))
-                f.write("\n\n")
-
-                for angle_type in self.angle_types:
-                    f.write("{:4d}".format(angle_type["i"]))
-                    if nb_styles > 1:
-                        f.write(" {:7s}".format(angle_type["style"]))
-                    if angle_type["coeffs"] is not None:
-                        for coeff in angle_type["coeffs"]:
-                            f.write(" {:9.4f}".format(coeff))
-                    write_comment(f, angle_type)
-                f.write("\n")
+            # Coeffs
+            if write_coeffs:
 
-            # Dihedral Coeffs
-            if self.dihedral_types != []:
-                f.write("Dihedral Coeffs")
-                nb_styles = len({d["style"] for d in self.dihedral_types})
-                if nb_styles == 1:
-                    style = self.dihedral_types[0]["style"]
-                    if style is not None:
-                        f.write(" # {:s}".format(style))
-                f.write("\n\n")
-
-                for dihedral_type in self.dihedral_types:
-                    f.write("{:4d}".format(dihedral_type["i"]))
-                    if nb_styles > 1:
-                        f.write(" {:7s}".format(dihedral_type["style"]))
-                    if dihedral_type["coeffs"] is not None:
-                        for coeff in dihedral_type["coeffs"]:
-                            f.write(" {:9.4f}".format(coeff))
-                    write_comment(f, dihedral_type)
-                f.write("\n")
+                # Styles of Pair Coeffs and PairIJ Coeffs
+                nb_styles = len({d["style"] for d in self.pair_types})
 
-            # Improper Coeffs
-            if self.improper_types != []:
-                f.write("Improper Coeffs")
-                nb_styles = len({d["style"] for d in self.improper_types})
-                if nb_styles == 1:
-                    style = self.improper_types[0]["style"]
-                    if style is not None:
-                        f.write(" # {:s}".format(style))
-                f.write("\n\n")
-
-                for improper_type in self.improper_types:
-                    f.write("{:4d}".format(improper_type["i"]))
-                    if nb_styles > 1:
-                        f.write(" {:7s}".format(improper_type["style"]))
-                    if improper_type["coeffs"] is not None:
-                        for coeff in improper_type["coeffs"]:
-                            f.write(" {:9.4f}".format(coeff))
-                    write_comment(f, improper_type)
+                # Pair Coeffs
+                if any(
+                    pair_type["atom_type_1"]["i"] == pair_type["atom_type_2"]["i"]
+                    for pair_type in self.pair_types
+                ):
+                    f.write("Pair Coeffs")
+                    if nb_styles == 1:
+                        style = self.pair_types[0]["style"]
+                        if style is not None:
+                            f.write(" # {:s}".format(style))
+                    f.write("\n\n")
+
+                    for pair_type in self.pair_types:
+                        if (
+                            pair_type["atom_type_1"]["i"]
+                            != pair_type["atom_type_2"]["i"]
+                        ):
+                            continue
+                        f.write("{:4d}".format(pair_type["atom_type_1"]["i"]))
+                        if nb_styles > 1:
+                            f.write(" {:7s}".format(pair_type["style"]))
+                        if pair_type["coeffs"] is not None:
+                            f.write(format_coeffs(pair_type["coeffs"]))
+                        write_comment(f, pair_type)
+                    f.write("\n")
+
+                # PairIJ Coeffs
+                if any(
+                    pair_type["atom_type_1"]["i"] != pair_type["atom_type_2"]["i"]
+                    for pair_type in self.pair_types
+                ):
+                    f.write("PairIJ Coeffs")
+                    if nb_styles == 1:
+                        style = self.pair_types[0]["style"]
+                        if style is not None:
+                            f.write(" # {:s}".format(style))
+                    f.write("\n\n")
+
+                    for pair_type in self.pair_types:
+                        if (
+                            pair_type["atom_type_1"]["i"]
+                            == pair_type["atom_type_2"]["i"]
+                        ):
+                            continue
+                        f.write(
+                            "{:4d} {:4d}".format(
+                                pair_type["atom_type_1"]["i"],
+                                pair_type["atom_type_2"]["i"],
+                            )
+                        )
+                        if nb_styles > 1:
+                            f.write(" {:7s}".format(pair_type["style"]))
+                        if pair_type["coeffs"] is not None:
+                            f.write(format_coeffs(pair_type["coeffs"]))
+                        write_comment(f, pair_type)
+                    f.write("\n")
+
+                # Bond Coeffs
+                if self.bond_types != []:
+                    f.write("Bond Coeffs")
+                    nb_styles = len({d["style"] for d in self.bond_types})
+                    if nb_styles == 1:
+                        style = self.bond_types[0]["style"]
+                        if style is not None:
+                            f.write(" # {:s}".format(style))
+                    f.write("\n\n")
+
+                    for bond_type in self.bond_types:
+                        f.write("{:4d}".format(bond_type["i"]))
+                        if nb_styles > 1:
+                            f.write(" {:7s}".format(bond_type["style"]))
+                        if bond_type["coeffs"] is not None:
+                            f.write(format_coeffs(bond_type["coeffs"]))
+                        write_comment(f, bond_type)
+                    f.write("\n")
+
+                # Angle Coeffs
+                if self.angle_types != []:
+                    f.write("Angle Coeffs")
+                    nb_styles = len({d["style"] for d in self.angle_types})
+                    if nb_styles == 1:
+                        style = self.angle_types[0]["style"]
+                        if style is not None:
+                            f.write(" # {:s}".format(style))
+                    f.write("\n\n")
+
+                    for angle_type in self.angle_types:
+                        f.write("{:4d}".format(angle_type["i"]))
+                        if nb_styles > 1:
+                            f.write(" {:7s}".format(angle_type["style"]))
+                        if angle_type["coeffs"] is not None:
+                            f.write(format_coeffs(angle_type["coeffs"]))
+                        write_comment(f, angle_type)
+                    f.write("\n")
+
+                # Dihedral Coeffs
+                if self.dihedral_types != []:
+                    f.write("Dihedral Coeffs")
+                    nb_styles = len({d["style"] for d in self.dihedral_types})
+                    if nb_styles == 1:
+                        style = self.dihedral_types[0]["style"]
+                        if style is not None:
+                            f.write(" # {:s}".format(style))
+                    f.write("\n\n")
+
+                    for dihedral_type in self.dihedral_types:
+                        f.write("{:4d}".format(dihedral_type["i"]))
+                        if nb_styles > 1:
+                            f.write(" {:7s}".format(dihedral_type["style"]))
+                        if dihedral_type["coeffs"] is not None:
+                            f.write(format_coeffs(dihedral_type["coeffs"]))
+                        write_comment(f, dihedral_type)
+                    f.write("\n")
+
+                # Improper Coeffs
+                if self.improper_types != []:
+                    f.write("Improper Coeffs")
+                    nb_styles = len({d["style"] for d in self.improper_types})
+                    if nb_styles == 1:
+                        style = self.improper_types[0]["style"]
+                        if style is not None:
+                            f.write(" # {:s}".format(style))
+                    f.write("\n\n")
+
+                    for improper_type in self.improper_types:
+                        f.write("{:4d}".format(improper_type["i"]))
+                        if nb_styles > 1:
+                            f.write(" {:7s}".format(improper_type["style"]))
+                        if improper_type["coeffs"] is not None:
+                            f.write(format_coeffs(improper_type["coeffs"]))
+                        write_comment(f, improper_type)
+                    f.write("\n")
+
+            # Atoms, sections are formatted in memory and written at once
+            if self.atoms != []:
+                f.write("Atoms # {:s}\n\n".format(self.atom_style))
+                # One format per atom style, checked once
+                lines = []
+                if self.atom_style == "full":
+                    # full = atom-ID molecule-ID atom-type q x y z
+                    for atom in self.atoms:
+                        line = "{:7d} {:7d} {:7d} {:9.6f} {:13.6e} {:13.6e} {:13.6e}".format(
+                            atom["i"],
+                            atom["mol_i"],
+                            atom["atom_type"]["i"],
+                            atom["charge"],
+                            atom["x"],
+                            atom["y"],
+                            atom["z"],
+                        )
+                        lines.append(
+                            line + format_image_flags(atom) + format_comment(atom)
+                        )
+                elif self.atom_style == "molecular":
+                    # molecular = atom-ID molecule-ID atom-type x y z
+                    for atom in self.atoms:
+                        line = "{:7d} {:7d} {:7d} {:13.6e} {:13.6e} {:13.6e}".format(
+                            atom["i"],
+                            atom["mol_i"],
+                            atom["atom_type"]["i"],
+                            atom["x"],
+                            atom["y"],
+                            atom["z"],
+                        )
+                        lines.append(
+                            line + format_image_flags(atom) + format_comment(atom)
+                        )
+                elif self.atom_style == "charge":
+                    # charge = atom-ID atom-type q x y z
+                    for atom in self.atoms:
+                        line = "{:7d} {:7d} {:9.6f} {:13.6e} {:13.6e} {:13.6e}".format(
+                            atom["i"],
+                            atom["atom_type"]["i"],
+                            atom["charge"],
+                            atom["x"],
+                            atom["y"],
+                            atom["z"],
+                        )
+                        lines.append(
+                            line + format_image_flags(atom) + format_comment(atom)
+                        )
+                f.write("".join(lines))
                 f.write("\n")
 
-        # Atoms
-        if self.atoms != []:
-            f.write("Atoms # {:s}\n\n".format(self.atom_style))
-            for atom in self.atoms:
-                # full = atom-ID molecule-ID atom-type q x y z
-                # molecular = atom-ID molecule-ID atom-type q x y z
-                # charge = atom-ID atom-type q x y z
-                f.write("{:7d}".format(atom["i"]))
-                if self.atom_style == "full" or self.atom_style == "molecular":
-                    f.write(" {:7d}".format(atom["mol_i"]))
-                f.write(" {:7d}".format(atom["atom_type"]["i"]))
-                if self.atom_style == "full" or self.atom_style == "charge":
-                    f.write(" {:9.6f}".format(atom["charge"]))
-                f.write(
-                    " {:13.6e} {:13.6e} {:13.6e}".format(
-                        atom["x"], atom["y"], atom["z"]
-                    )
-                )
-                if "nx" in atom and "ny" in atom and "nz" in atom:
-                    f.write(
-                        " {:d} {:d} {:d}".format(atom["nx"], atom["ny"], atom["nz"])
-                    )
-                write_comment(f, atom)
-            f.write("\n")
-
-        # Velocities
-        if self.atoms != [] and (
-            "vx" in self.atoms[0] and "vy" in self.atoms[0] and "vz" in self.atoms[0]
-        ):
-            f.write("Velocities\n\n")
-            for atom in self.atoms:
+            # Velocities
+            if self.atoms != [] and (
+                "vx" in self.atoms[0]
+                and "vy" in self.atoms[0]
+                and "vz" in self.atoms[0]
+            ):
+                f.write("Velocities\n\n")
                 f.write(
-                    "{:7d} {:13.6e} {:13.6e} {:13.6e}".format(
-                        atom["i"], atom["vx"], atom["vy"], atom["vz"]
+                    "".join(
+                        "{:7d} {:13.6e} {:13.6e} {:13.6e}".format(
+                            atom["i"], atom["vx"], atom["vy"], atom["vz"]
+                        )
+                        + format_comment(atom)
+                        for atom in self.atoms
                     )
                 )
-                write_comment(f, atom)
-            f.write("\n")
+                f.write("\n")
 
-        # Bonds
-        if self.bonds != []:
-            f.write("Bonds\n\n")
-            for bond in self.bonds:
+            # Bonds
+            if self.bonds != []:
+                f.write("Bonds\n\n")
                 f.write(
-                    "{:7d} {:7d} {:7d} {:7d}".format(
-                        bond["i"],
-                        bond["bond_type"]["i"],
-                        bond["atom1"]["i"],
-                        bond["atom2"]["i"],
+                    "".join(
+                        "{:7d} {:7d} {:7d} {:7d}".format(
+                            bond["i"],
+                            bond["bond_type"]["i"],
+                            bond["atom1"]["i"],
+                            bond["atom2"]["i"],
+                        )
+                        + format_comment(bond)
+                        for bond in self.bonds
                     )
                 )
-                write_comment(f, bond)
-            f.write("\n")
+                f.write("\n")
 
-        # Angles
-        if self.angles != []:
-            f.write("Angles\n\n")
-            for angle in self.angles:
+            # Angles
+            if self.angles != []:
+                f.write("Angles\n\n")
                 f.write(
-                    "{:7d} {:7d} {:7d} {:7d} {:7d}".format(
-                        angle["i"],
-                        angle["angle_type"]["i"],
-                        angle["atom1"]["i"],
-                        angle["atom2"]["i"],
-                        angle["atom3"]["i"],
+                    "".join(
+                        "{:7d} {:7d} {:7d} {:7d} {:7d}".format(
+                            angle["i"],
+                            angle["angle_type"]["i"],
+                            angle["atom1"]["i"],
+                            angle["atom2"]["i"],
+                            angle["atom3"]["i"],
+                        )
+                        + format_comment(angle)
+                        for angle in self.angles
                     )
                 )
-                write_comment(f, angle)
-            f.write("\n")
+                f.write("\n")
 
-        # Dihedrals
-        if self.dihedrals != []:
-            f.write("Dihedrals\n\n")
-            for dihedral in self.dihedrals:
+            # Dihedrals
+            if self.dihedrals != []:
+                f.write("Dihedrals\n\n")
                 f.write(
-                    "{:7d} {:7d} {:7d} {:7d} {:7d} {:7d}".format(
-                        dihedral["i"],
-                        dihedral["dihedral_type"]["i"],
-                        dihedral["atom1"]["i"],
-                        dihedral["atom2"]["i"],
-                        dihedral["atom3"]["i"],
-                        dihedral["atom4"]["i"],
+                    "".join(
+                        "{:7d} {:7d} {:7d} {:7d} {:7d} {:7d}".format(
+                            dihedral["i"],
+                            dihedral["dihedral_type"]["i"],
+                            dihedral["atom1"]["i"],
+                            dihedral["atom2"]["i"],
+                            dihedral["atom3"]["i"],
+                            dihedral["atom4"]["i"],
+                        )
+                        + format_comment(dihedral)
+                        for dihedral in self.dihedrals
                     )
                 )
-                write_comment(f, dihedral)
-            f.write("\n")
+                f.write("\n")
 
-        # Impropers
-        if self.impropers != []:
-            f.write("Impropers\n\n")
-            for improper in self.impropers:
+            # Impropers
+            if self.impropers != []:
+                f.write("Impropers\n\n")
                 f.write(
-                    "{:7d} {:7d} {:7d} {:7d} {:7d} {:7d}".format(
-                        improper["i"],
-                        improper["improper_type"]["i"],
-                        improper["atom1"]["i"],
-                        improper["atom2"]["i"],
-                        improper["atom3"]["i"],
-                        improper["atom4"]["i"],
+                    "".join(
+                        "{:7d} {:7d} {:7d} {:7d} {:7d} {:7d}".format(
+                            improper["i"],
+                            improper["improper_type"]["i"],
+                            improper["atom1"]["i"],
+                            improper["atom2"]["i"],
+                            improper["atom3"]["i"],
+                            improper["atom4"]["i"],
+                        )
+                        + format_comment(improper)
+                        for improper in self.impropers
                     )
                 )
-                write_comment(f, improper)
-            f.write("\n")
-
-        f.close()
+                f.write("\n")
 
     def write_pair_coeffs_to_file(self, filename="pair.coeffs"):
         """
@@ -1750,25 +1899,21 @@ class Data(object):
                 "No pair type, no need to write {:s} file.".format(filename)
             )
 
-        f = open(filename, "w")
-
-        nb_styles = len({d["style"] for d in self.pair_types})
-        for pair_type in self.pair_types:
-            f.write(
-                "pair_coeff {:4d} {:4d}".format(
-                    pair_type["atom_type_1"]["i"], pair_type["atom_type_2"]["i"]
+        with open(filename, "w") as f:
+            nb_styles = len({d["style"] for d in self.pair_types})
+            for pair_type in self.pair_types:
+                f.write(
+                    "pair_coeff {:4d} {:4d}".format(
+                        pair_type["atom_type_1"]["i"], pair_type["atom_type_2"]["i"]
+                    )
                 )
-            )
-            if nb_styles > 1:
-                f.write(" {:7s}".format(pair_type["style"]))
-            if pair_type["coeffs"] is not None:
-                for coeff in pair_type["coeffs"]:
-                    f.write(" {:9.4f}".format(coeff))
-            else:
-                f.write(" ?")
-            write_comment(f, pair_type)
-
-        f.close()
+                if nb_styles > 1:
+                    f.write(" {:7s}".format(pair_type["style"]))
+                if pair_type["coeffs"] is not None:
+                    f.write(format_coeffs(pair_type["coeffs"]))
+                else:
+                    f.write(" ?")
+                write_comment(f, pair_type)
 
     def write_bond_coeffs_to_file(self, filename="bond.coeffs"):
         """
@@ -1784,21 +1929,17 @@ class Data(object):
                 "No bond type, no need to write {:s} file.".format(filename)
             )
 
-        f = open(filename, "w")
-
-        nb_styles = len({d["style"] for d in self.bond_types})
-        for bond_type in self.bond_types:
-            f.write("bond_coeff {:4d}".format(bond_type["i"]))
-            if nb_styles > 1:
-                f.write(" {:7s}".format(bond_type["style"]))
-            if bond_type["coeffs"] is not None:
-                for coeff in bond_type["coeffs"]:
-                    f.write(" {:9.4f}".format(coeff))
-            else:
-                f.write(" ?")
-            write_comment(f, bond_type)
-
-        f.close()
+        with open(filename, "w") as f:
+            nb_styles = len({d["style"] for d in self.bond_types})
+            for bond_type in self.bond_types:
+                f.write("bond_coeff {:4d}".format(bond_type["i"]))
+                if nb_styles > 1:
+                    f.write(" {:7s}".format(bond_type["style"]))
+                if bond_type["coeffs"] is not None:
+                    f.write(format_coeffs(bond_type["coeffs"]))
+                else:
+                    f.write(" ?")
+                write_comment(f, bond_type)
 
     def write_angle_coeffs_to_file(self, filename="angle.coeffs"):
         """
@@ -1814,21 +1955,17 @@ class Data(object):
                 "No angle type, no need to write {:s} file.".format(filename)
             )
 
-        f = open(filename, "w")
-
-        nb_styles = len({d["style"] for d in self.angle_types})
-        for angle_type in self.angle_types:
-            f.write("angle_coeff {:4d}".format(angle_type["i"]))
-            if nb_styles > 1:
-                f.write(" {:7s}".format(angle_type["style"]))
-            if angle_type["coeffs"] is not None:
-                for coeff in angle_type["coeffs"]:
-                    f.write(" {:9.4f}".format(coeff))
-            else:
-                f.write(" ?")
-            write_comment(f, angle_type)
-
-        f.close()
+        with open(filename, "w") as f:
+            nb_styles = len({d["style"] for d in self.angle_types})
+            for angle_type in self.angle_types:
+                f.write("angle_coeff {:4d}".format(angle_type["i"]))
+                if nb_styles > 1:
+                    f.write(" {:7s}".format(angle_type["style"]))
+                if angle_type["coeffs"] is not None:
+                    f.write(format_coeffs(angle_type["coeffs"]))
+                else:
+                    f.write(" ?")
+                write_comment(f, angle_type)
 
     def write_dihedral_coeffs_to_file(self, filename="dihedral.coeffs"):
         """
@@ -1844,21 +1981,17 @@ class Data(object):
                 "No dihedral type, no need to write {:s} file.".format(filename)
             )
 
-        f = open(filename, "w")
-
-        nb_styles = len({d["style"] for d in self.dihedral_types})
-        for dihedral_type in self.dihedral_types:
-            f.write("dihedral_coeff {:4d}".format(dihedral_type["i"]))
-            if nb_styles > 1:
-                f.write(" {:7s}".format(dihedral_type["style"]))
-            if dihedral_type["coeffs"] is not None:
-                for coeff in dihedral_type["coeffs"]:
-                    f.write(" {:9.4f}".format(coeff))
-            else:
-                f.write(" ?")
-            write_comment(f, dihedral_type)
-
-        f.close()
+        with open(filename, "w") as f:
+            nb_styles = len({d["style"] for d in self.dihedral_types})
+            for dihedral_type in self.dihedral_types:
+                f.write("dihedral_coeff {:4d}".format(dihedral_type["i"]))
+                if nb_styles > 1:
+                    f.write(" {:7s}".format(dihedral_type["style"]))
+                if dihedral_type["coeffs"] is not None:
+                    f.write(format_coeffs(dihedral_type["coeffs"]))
+                else:
+                    f.write(" ?")
+                write_comment(f, dihedral_type)
 
     def write_improper_coeffs_to_file(self, filename="improper.coeffs"):
         """
@@ -1874,21 +2007,17 @@ class Data(object):
                 "No improper type, no need to write {:s} file.".format(filename)
             )
 
-        f = open(filename, "w")
-
-        nb_styles = len({d["style"] for d in self.improper_types})
-        for improper_type in self.improper_types:
-            f.write("improper_coeff {:4d}".format(improper_type["i"]))
-            if nb_styles > 1:
-                f.write(" {:7s}".format(improper_type["style"]))
-            if improper_type["coeffs"] is not None:
-                for coeff in improper_type["coeffs"]:
-                    f.write(" {:9.4f}".format(coeff))
-            else:
-                f.write(" ?")
-            write_comment(f, improper_type)
-
-        f.close()
+        with open(filename, "w") as f:
+            nb_styles = len({d["style"] for d in self.improper_types})
+            for improper_type in self.improper_types:
+                f.write("improper_coeff {:4d}".format(improper_type["i"]))
+                if nb_styles > 1:
+                    f.write(" {:7s}".format(improper_type["style"]))
+                if improper_type["coeffs"] is not None:
+                    f.write(format_coeffs(improper_type["coeffs"]))
+                else:
+                    f.write(" ?")
+                write_comment(f, improper_type)
 
     def auto_comment_from_atom_types(self, sep="-"):
         """
@@ -1899,11 +2028,14 @@ class Data(object):
         sep : str, default '-'
             Separator used by `join()` method.
         """
+        # Comments are interned, all items of the same types share them
         for pair_type in self.pair_types:
-            pair_type["comment"] = sep.join(
-                (
-                    pair_type["atom_type_1"]["comment"],
-                    pair_type["atom_type_2"]["comment"],
+            pair_type["comment"] = sys.intern(
+                sep.join(
+                    (
+                        pair_type["atom_type_1"]["comment"],
+                        pair_type["atom_type_2"]["comment"],
+                    )
                 )
             )
         for atom in self.atoms:
@@ -1911,19 +2043,21 @@ class Data(object):
         for bond in self.bonds:
             atom1 = bond["atom1"]
             atom2 = bond["atom2"]
-            bond["comment"] = sep.join(
-                (atom1["atom_type"]["comment"], atom2["atom_type"]["comment"])
+            bond["comment"] = sys.intern(
+                sep.join((atom1["atom_type"]["comment"], atom2["atom_type"]["comment"]))
             )
             bond["bond_type"]["comment"] = bond["comment"]
         for angle in self.angles:
             atom1 = angle["atom1"]
             atom2 = angle["atom2"]
             atom3 = angle["atom3"]
-            angle["comment"] = sep.join(
-                (
-                    atom1["atom_type"]["comment"],
-                    atom2["atom_type"]["comment"],
-                    atom3["atom_type"]["comment"],
+            angle["comment"] = sys.intern(
+                sep.join(
+                    (
+                        atom1["atom_type"]["comment"],
+                        atom2["atom_type"]["comment"],
+                        atom3["atom_type"]["comment"],
+                    )
                 )
             )
             angle["angle_type"]["comment"] = angle["comment"]
@@ -1932,12 +2066,14 @@ class Data(object):
             atom2 = dihedral["atom2"]
             atom3 = dihedral["atom3"]
             atom4 = dihedral["atom4"]
-            dihedral["comment"] = sep.join(
-                (
-                    atom1["atom_type"]["comment"],
-                    atom2["atom_type"]["comment"],
-                    atom3["atom_type"]["comment"],
-                    atom4["atom_type"]["comment"],
+            dihedral["comment"] = sys.intern(
+                sep.join(
+                    (
+                        atom1["atom_type"]["comment"],
+                        atom2["atom_type"]["comment"],
+                        atom3["atom_type"]["comment"],
+                        atom4["atom_type"]["comment"],
+                    )
                 )
             )
             dihedral["dihedral_type"]["comment"] = dihedral["comment"]
@@ -1946,12 +2082,14 @@ class Data(object):
             atom2 = improper["atom2"]
             atom3 = improper["atom3"]
             atom4 = improper["atom4"]
-            improper["comment"] = sep.join(
-                (
-                    atom1["atom_type"]["comment"],
-                    atom2["atom_type"]["comment"],
-                    atom3["atom_type"]["comment"],
-                    atom4["atom_type"]["comment"],
+            improper["comment"] = sys.intern(
+                sep.join(
+                    (
+                        atom1["atom_type"]["comment"],
+                        atom2["atom_type"]["comment"],
+                        atom3["atom_type"]["comment"],
+                        atom4["atom_type"]["comment"],
+                    )
                 )
             )
             improper["improper_type"]["comment"] = improper["comment"]
@@ -1965,6 +2103,9 @@ class Data(object):
         networkx.Graph
             Atoms are assigned as nodes. Bonds are assigned as edges.
         """
+        # Imported here, NetworkX is slow to import and only used for graphs
+        import networkx as nx
+
         G = nx.Graph()
         G.add_nodes_from([(atom["i"], atom) for atom in self.atoms])
         G.add_edges_from(
@@ -1988,17 +2129,26 @@ class Data(object):
         for atom in self.atoms:
             atom["mol_i"] = None
 
-        G = self.to_networkx()
+        # Bonded atoms of each atom
+        neighbours = {atom["i"]: [] for atom in self.atoms}
+        for bond in self.bonds:
+            i = bond["atom1"]["i"]
+            j = bond["atom2"]["i"]
+            neighbours[i].append(j)
+            neighbours[j].append(i)
 
         mol_i = 0
-        for node in G.nodes:
-            if G.nodes[node]["mol_i"] is None:
+        for i in neighbours:
+            if self.atoms[i - 1]["mol_i"] is None:
                 mol_i += 1
-                G.nodes[node]["mol_i"] = mol_i
-                self.atoms[node - 1]["mol_i"] = mol_i
-                for descendant in nx.descendants(G, node):
-                    G.nodes[descendant]["mol_i"] = mol_i
-                    self.atoms[descendant - 1]["mol_i"] = mol_i
+                self.atoms[i - 1]["mol_i"] = mol_i
+                # Depth-first search of all atoms connected to this one
+                stack = [i]
+                while stack:
+                    for j in neighbours[stack.pop()]:
+                        if self.atoms[j - 1]["mol_i"] is None:
+                            self.atoms[j - 1]["mol_i"] = mol_i
+                            stack.append(j)
 
     def reset_atom_types(self):
         """
@@ -2009,6 +2159,10 @@ class Data(object):
         """
         self.atom_types = []
 
+        # First atom type of each mass, and of each mass and comment
+        atom_types = {}
+        atom_types_with_comment = {}
+
         for atom in self.atoms:
             mass = atom["atom_type"]["mass"]
             if "comment" in atom["atom_type"]:
@@ -2016,26 +2170,26 @@ class Data(object):
             else:
                 comment = None
 
-            # Try to find atom type in the list
-            not_new = False
-            for atom_type in self.atom_types:
-                if atom_type["mass"] == mass:
-                    if (
-                        "comment" in atom_type and atom_type["comment"] == comment
-                    ) or comment is None:
-                        not_new = True
-                        # Old atom type knows its new atom type to help reset pair types
-                        atom["atom_type"]["atom_type"] = atom_type
-                        # Do not forget to update atom type (i may have changed)
-                        atom["atom_type"] = atom_type
-                        break
-            if not_new:
+            # Try to find atom type, without comment any comment matches
+            if comment is None:
+                atom_type = atom_types.get(mass)
+            else:
+                atom_type = atom_types_with_comment.get((mass, comment))
+            if atom_type is not None:
+                # Old atom type knows its new atom type to help reset pair types
+                atom["atom_type"]["atom_type"] = atom_type
+                # Do not forget to update atom type (i may have changed)
+                atom["atom_type"] = atom_type
                 continue
 
             # Add a new atom type to the list
             self.add_atom_type(i=None, mass=mass, comment=comment)
             atom["atom_type"] = self.atom_types[-1]
 
+            atom_types.setdefault(mass, atom["atom_type"])
+            if comment is not None:
+                atom_types_with_comment.setdefault((mass, comment), atom["atom_type"])
+
         # Information is only available in the list, need to copy before reset
         old_pair_types = self.pair_types
         self.pair_types = []
@@ -2058,11 +2212,7 @@ class Data(object):
                 self.add_pair_type((j, i), coeffs=coeffs, style=style, comment=comment)
 
         # Remove duplicates (if number of atom types has been reduced)
-        self.pair_types = [
-            pair_type
-            for n, pair_type in enumerate(self.pair_types)
-            if pair_type not in self.pair_types[n + 1 :]
-        ]
+        self._remove_duplicate_pair_types()
 
         # Sort pair types by first atom type then by second atom type
         self.pair_types.sort(
@@ -2085,12 +2235,20 @@ class Data(object):
         """
         self.bond_types = []
 
+        # First bond type of each key, and of each key and comment
+        bond_types = {}
+        bond_types_with_comment = {}
+
         for bond in self.bonds:
-            # Extra information to check first
-            atom_types = (bond["atom1"]["atom_type"], bond["atom2"]["atom_type"])
-            atom_types_rev = list(atom_types)
-            atom_types_rev.reverse()
-            atom_types_rev = tuple(atom_types_rev)
+            # Atom types, matched by identity in both directions
+            ids = (
+                id(bond["atom1"]["atom_type"]),
+                id(bond["atom2"]["atom_type"]),
+            )
+            if match_atypes:
+                ids = min(ids, ids[::-1])
+            else:
+                ids = None
 
             coeffs = bond["bond_type"]["coeffs"]
             style = bond["bond_type"]["style"]
@@ -2099,41 +2257,24 @@ class Data(object):
             else:
                 comment = None
 
-            # Try to find bond type in the list
-            not_new = False
-            for bond_type in self.bond_types:
-                if (
-                    (
-                        not match_atypes
-                        or (
-                            match_atypes
-                            and bond_type["atom_types"] == atom_types
-                            or bond_type["atom_types"] == atom_types_rev
-                        )
-                    )
-                    and bond_type["coeffs"] == coeffs
-                    and bond_type["style"] == style
-                ):
-                    if (
-                        "comment" in bond_type and bond_type["comment"] == comment
-                    ) or comment is None:
-                        not_new = True
-                        # Do not forget to update bond type (i may have changed)
-                        bond["bond_type"] = bond_type
-                        break
-            if not_new:
+            # Try to find bond type, without comment any comment matches
+            key = (ids, tuple(coeffs) if coeffs is not None else None, style)
+            if comment is None:
+                bond_type = bond_types.get(key)
+            else:
+                bond_type = bond_types_with_comment.get((key, comment))
+            if bond_type is not None:
+                # Do not forget to update bond type (i may have changed)
+                bond["bond_type"] = bond_type
                 continue
 
             # Add a new bond type to the list
             self.add_bond_type(i=None, coeffs=coeffs, style=style, comment=comment)
             bond["bond_type"] = self.bond_types[-1]
 
-            # Add extra information
-            bond["bond_type"]["atom_types"] = atom_types
-
-        # Delete extra information
-        for bond_type in self.bond_types:
-            del bond_type["atom_types"]
+            bond_types.setdefault(key, bond["bond_type"])
+            if comment is not None:
+                bond_types_with_comment.setdefault((key, comment), bond["bond_type"])
 
     def reset_angle_types(self, match_atypes=True):
         """
@@ -2148,16 +2289,21 @@ class Data(object):
         """
         self.angle_types = []
 
+        # First angle type of each key, and of each key and comment
+        angle_types = {}
+        angle_types_with_comment = {}
+
         for angle in self.angles:
-            # Extra information to check first
-            atom_types = (
-                angle["atom1"]["atom_type"],
-                angle["atom2"]["atom_type"],
-                angle["atom3"]["atom_type"],
+            # Atom types, matched by identity in both directions
+            ids = (
+                id(angle["atom1"]["atom_type"]),
+                id(angle["atom2"]["atom_type"]),
+                id(angle["atom3"]["atom_type"]),
             )
-            atom_types_rev = list(atom_types)
-            atom_types_rev.reverse()
-            atom_types_rev = tuple(atom_types_rev)
+            if match_atypes:
+                ids = min(ids, ids[::-1])
+            else:
+                ids = None
 
             coeffs = angle["angle_type"]["coeffs"]
             style = angle["angle_type"]["style"]
@@ -2166,41 +2312,24 @@ class Data(object):
             else:
                 comment = None
 
-            # Try to find angle type in the list
-            not_new = False
-            for angle_type in self.angle_types:
-                if (
-                    (
-                        not match_atypes
-                        or (
-                            match_atypes
-                            and angle_type["atom_types"] == atom_types
-                            or angle_type["atom_types"] == atom_types_rev
-                        )
-                    )
-                    and angle_type["coeffs"] == coeffs
-                    and angle_type["style"] == style
-                ):
-                    if (
-                        "comment" in angle_type and angle_type["comment"] == comment
-                    ) or comment is None:
-                        not_new = True
-                        # Do not forget to update angle type (i may have changed)
-                        angle["angle_type"] = angle_type
-                        break
-            if not_new:
+            # Try to find angle type, without comment any comment matches
+            key = (ids, tuple(coeffs) if coeffs is not None else None, style)
+            if comment is None:
+                angle_type = angle_types.get(key)
+            else:
+                angle_type = angle_types_with_comment.get((key, comment))
+            if angle_type is not None:
+                # Do not forget to update angle type (i may have changed)
+                angle["angle_type"] = angle_type
                 continue
 
             # Add a new angle type to the list
             self.add_angle_type(i=None, coeffs=coeffs, style=style, comment=comment)
             angle["angle_type"] = self.angle_types[-1]
 
-            # Add extra information
-            angle["angle_type"]["atom_types"] = atom_types
-
-        # Delete extra information
-        for angle_type in self.angle_types:
-            del angle_type["atom_types"]
+            angle_types.setdefault(key, angle["angle_type"])
+            if comment is not None:
+                angle_types_with_comment.setdefault((key, comment), angle["angle_type"])
 
     def reset_dihedral_types(self, match_atypes=True):
         """
@@ -2215,17 +2344,22 @@ class Data(object):
         """
         self.dihedral_types = []
 
+        # First dihedral type of each key, and of each key and comment
+        dihedral_types = {}
+        dihedral_types_with_comment = {}
+
         for dihedral in self.dihedrals:
-            # Extra information to check first
-            atom_types = (
-                dihedral["atom1"]["atom_type"],
-                dihedral["atom2"]["atom_type"],
-                dihedral["atom3"]["atom_type"],
-                dihedral["atom4"]["atom_type"],
+            # Atom types, matched by identity in both directions
+            ids = (
+                id(dihedral["atom1"]["atom_type"]),
+                id(dihedral["atom2"]["atom_type"]),
+                id(dihedral["atom3"]["atom_type"]),
+                id(dihedral["atom4"]["atom_type"]),
             )
-            atom_types_rev = list(atom_types)
-            atom_types_rev.reverse()
-            atom_types_rev = tuple(atom_types_rev)
+            if match_atypes:
+                ids = min(ids, ids[::-1])
+            else:
+                ids = None
 
             coeffs = dihedral["dihedral_type"]["coeffs"]
             style = dihedral["dihedral_type"]["style"]
@@ -2234,42 +2368,26 @@ class Data(object):
             else:
                 comment = None
 
-            # Try to find dihedral type in the list
-            not_new = False
-            for dihedral_type in self.dihedral_types:
-                if (
-                    (
-                        not match_atypes
-                        or (
-                            match_atypes
-                            and dihedral_type["atom_types"] == atom_types
-                            or dihedral_type["atom_types"] == atom_types_rev
-                        )
-                    )
-                    and dihedral_type["coeffs"] == coeffs
-                    and dihedral_type["style"] == style
-                ):
-                    if (
-                        "comment" in dihedral_type
-                        and dihedral_type["comment"] == comment
-                    ) or comment is None:
-                        not_new = True
-                        # Do not forget to update dihedral type (i may have changed)
-                        dihedral["dihedral_type"] = dihedral_type
-                        break
-            if not_new:
+            # Try to find dihedral type, without comment any comment matches
+            key = (ids, tuple(coeffs) if coeffs is not None else None, style)
+            if comment is None:
+                dihedral_type = dihedral_types.get(key)
+            else:
+                dihedral_type = dihedral_types_with_comment.get((key, comment))
+            if dihedral_type is not None:
+                # Do not forget to update dihedral type (i may have changed)
+                dihedral["dihedral_type"] = dihedral_type
                 continue
 
             # Add a new dihedral type to the list
             self.add_dihedral_type(i=None, coeffs=coeffs, style=style, comment=comment)
             dihedral["dihedral_type"] = self.dihedral_types[-1]
 
-            # Add extra information
-            dihedral["dihedral_type"]["atom_types"] = atom_types
-
-        # Delete extra information
-        for dihedral_type in self.dihedral_types:
-            del dihedral_type["atom_types"]
+            dihedral_types.setdefault(key, dihedral["dihedral_type"])
+            if comment is not None:
+                dihedral_types_with_comment.setdefault(
+                    (key, comment), dihedral["dihedral_type"]
+                )
 
     def reset_improper_types(self):
         """
@@ -2293,43 +2411,23 @@ class Data(object):
 
         self.improper_types = []
 
+        # First improper type of each key, and of each key and comment
+        improper_types = {}
+        improper_types_with_comment = {}
+
         for improper in self.impropers:
             # Extra information to check first
-            atom_typesA = (
-                improper["atom1"]["atom_type"],
-                improper["atom2"]["atom_type"],
-                improper["atom3"]["atom_type"],
-                improper["atom4"]["atom_type"],
-            )
-            atom_typesB = (
-                improper["atom1"]["atom_type"],
-                improper["atom2"]["atom_type"],
-                improper["atom4"]["atom_type"],
-                improper["atom3"]["atom_type"],
-            )
-            atom_typesC = (
+            atom_types = (
                 improper["atom1"]["atom_type"],
-                improper["atom3"]["atom_type"],
                 improper["atom2"]["atom_type"],
-                improper["atom4"]["atom_type"],
-            )
-            atom_typesD = (
-                improper["atom1"]["atom_type"],
                 improper["atom3"]["atom_type"],
                 improper["atom4"]["atom_type"],
-                improper["atom2"]["atom_type"],
-            )
-            atom_typesE = (
-                improper["atom1"]["atom_type"],
-                improper["atom4"]["atom_type"],
-                improper["atom2"]["atom_type"],
-                improper["atom3"]["atom_type"],
             )
-            atom_typesF = (
-                improper["atom1"]["atom_type"],
-                improper["atom4"]["atom_type"],
-                improper["atom3"]["atom_type"],
-                improper["atom2"]["atom_type"],
+
+            # Atom types, matched by identity whatever the order of the last three
+            ids = (
+                id(improper["atom1"]["atom_type"]),
+                tuple(sorted(id(atom_type) for atom_type in atom_types[1:])),
             )
 
             coeffs = improper["improper_type"]["coeffs"]
@@ -2339,64 +2437,82 @@ class Data(object):
             else:
                 comment = None
 
-            # Try to find improper type in the list
-            not_new = False
-            for improper_type in self.improper_types:
-                if (
-                    (
-                        improper_type["atom_types"] == atom_typesA
-                        or improper_type["atom_types"] == atom_typesB
-                        or improper_type["atom_types"] == atom_typesC
-                        or improper_type["atom_types"] == atom_typesD
-                        or improper_type["atom_types"] == atom_typesE
-                        or improper_type["atom_types"] == atom_typesF
-                    )
-                    and improper_type["coeffs"] == coeffs
-                    and improper_type["style"] == style
+            # Try to find improper type, without comment any comment matches
+            key = (ids, tuple(coeffs) if coeffs is not None else None, style)
+            if comment is None:
+                improper_type = improper_types.get(key)
+            else:
+                improper_type = improper_types_with_comment.get((key, comment))
+            if improper_type is not None:
+                # Reput the atoms in the same order as the improper type
+                # because the force field parameters are not symetrical,
+                # permutations are only built once an improper type is found
+                atom_type1, atom_type2, atom_type3, atom_type4 = atom_types
+                if improper_type["atom_types"] == (
+                    atom_type1,
+                    atom_type2,
+                    atom_type4,
+                    atom_type3,
                 ):
-                    if (
-                        "comment" in improper_type
-                        and improper_type["comment"] == comment
-                    ) or comment is None:
-                        not_new = True
-                        # Reput the atoms in the same order as the improper type
-                        # because the force field parameters are not symetrical
-                        if improper_type["atom_types"] == atom_typesB:
-                            atom3 = improper["atom3"]
-                            improper["atom3"] = improper["atom4"]
-                            improper["atom4"] = atom3
-                        elif improper_type["atom_types"] == atom_typesC:
-                            atom2 = improper["atom2"]
-                            improper["atom2"] = improper["atom3"]
-                            improper["atom3"] = atom2
-                        elif improper_type["atom_types"] == atom_typesD:
-                            atom2 = improper["atom2"]
-                            improper["atom2"] = improper["atom3"]
-                            improper["atom3"] = improper["atom4"]
-                            improper["atom4"] = atom2
-                        elif improper_type["atom_types"] == atom_typesE:
-                            atom2 = improper["atom2"]
-                            improper["atom2"] = improper["atom4"]
-                            atom3 = improper["atom3"]
-                            improper["atom3"] = atom2
-                            improper["atom4"] = atom3
-                        elif improper_type["atom_types"] == atom_typesF:
-                            atom2 = improper["atom2"]
-                            improper["atom2"] = improper["atom4"]
-                            improper["atom4"] = atom2
-                        # Be careful, the comment (may correspond to improper name) is not switched
-                        # Do not forget to update improper type (i may have changed)
-                        improper["improper_type"] = improper_type
-                        break
-            if not_new:
+                    atom3 = improper["atom3"]
+                    improper["atom3"] = improper["atom4"]
+                    improper["atom4"] = atom3
+                elif improper_type["atom_types"] == (
+                    atom_type1,
+                    atom_type3,
+                    atom_type2,
+                    atom_type4,
+                ):
+                    atom2 = improper["atom2"]
+                    improper["atom2"] = improper["atom3"]
+                    improper["atom3"] = atom2
+                elif improper_type["atom_types"] == (
+                    atom_type1,
+                    atom_type3,
+                    atom_type4,
+                    atom_type2,
+                ):
+                    atom2 = improper["atom2"]
+                    improper["atom2"] = improper["atom3"]
+                    improper["atom3"] = improper["atom4"]
+                    improper["atom4"] = atom2
+                elif improper_type["atom_types"] == (
+                    atom_type1,
+                    atom_type4,
+                    atom_type2,
+                    atom_type3,
+                ):
+                    atom2 = improper["atom2"]
+                    improper["atom2"] = improper["atom4"]
+                    atom3 = improper["atom3"]
+                    improper["atom3"] = atom2
+                    improper["atom4"] = atom3
+                elif improper_type["atom_types"] == (
+                    atom_type1,
+                    atom_type4,
+                    atom_type3,
+                    atom_type2,
+                ):
+                    atom2 = improper["atom2"]
+                    improper["atom2"] = improper["atom4"]
+                    improper["atom4"] = atom2
+                # Be careful, the comment (may correspond to improper name) is not switched
+                # Do not forget to update improper type (i may have changed)
+                improper["improper_type"] = improper_type
                 continue
 
             # Add a new improper type to the list
             self.add_improper_type(i=None, coeffs=coeffs, style=style, comment=comment)
             improper["improper_type"] = self.improper_types[-1]
 
+            improper_types.setdefault(key, improper["improper_type"])
+            if comment is not None:
+                improper_types_with_comment.setdefault(
+                    (key, comment), improper["improper_type"]
+                )
+
             # Add extra information
-            improper["improper_type"]["atom_types"] = atom_typesA
+            improper["improper_type"]["atom_types"] = atom_types
 
         # Delete extra information
         for improper_type in self.improper_types:
@@ -2,10 +2,11 @@
 
 import logging
 import io
-import gzip
 import itertools
+import weakref
 import pandas as pd
 
+from .utils import open_file
 
 # Rename LAMMPS Data atoms keys for consistency with Dump format
 DatatoDump = {
@@ -43,6 +44,10 @@ class Dump(object):
 
     Examples
     --------
+    Read all configurations and close the file on exit:
+
+    >>> with Dump("dump.lammpstrj", raw=False) as f:
+    ...     confs = list(f)
     """
 
     def __init__(
@@ -56,33 +61,21 @@ class Dump(object):
 
         self.filename = filename
 
-        # Try first gzip and fall back to normal if failed
-        try:
-            self.f = gzip.open(filename, "rt")
-            # Test the read
-            line = self.f.readline().strip()
-            if line != "ITEM: TIMESTEP":
-                raise ValueError(
-                    "File {:s} does not seem to be a valid LAMMPS Dump file".format(
-                        self.filename
-                    )
-                )
-            self.f.close()
-            # If OK, reopen it
-            self.f = gzip.open(filename, "rt")
-        except IOError:
-            self.f = open(filename, "r")
-            # Test the read
-            line = self.f.readline().strip()
-            if line != "ITEM: TIMESTEP":
-                raise ValueError(
-                    "File {:s} does not seem to be a valid LAMMPS Dump file".format(
-                        self.filename
-                    )
+        # Open in binary mode, only header lines are decoded
+        self.f = open_file(filename)
+        # Close the file if the reader is garbage collected without `with`
+        weakref.finalize(self, self.f.close)
+
+        # Test the read
+        line = self.f.readline().strip()
+        if line != b"ITEM: TIMESTEP":
+            raise ValueError(
+                "File {:s} does not seem to be a valid LAMMPS Dump file".format(
+                    self.filename
                 )
-            self.f.close()
-            # If OK, reopen it
-            self.f = open(filename, "r")
+            )
+        # If OK, rewind it
+        self.f.seek(0)
 
         self.raw = raw
         self.pandas = pandas
@@ -108,7 +101,14 @@ class Dump(object):
                     "LAMMPS Data information not added to LAMMPS Dump"
                 )
 
-    def __del__(self):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the LAMMPS Dump file."""
         try:
             self.f.close()
         except Exception:
@@ -129,7 +129,7 @@ class Dump(object):
         conf = {}
 
         # TimeStep
-        line = next(self.f).strip()
+        line = next(self.f).decode().strip()
         if line == "":
             raise StopIteration
         if line != "ITEM: TIMESTEP":
@@ -141,7 +141,7 @@ class Dump(object):
         conf["timestep"] = int(next(self.f))
 
         # Number of atoms
-        line = next(self.f).strip()
+        line = next(self.f).decode().strip()
         if line != "ITEM: NUMBER OF ATOMS":
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS Dump file".format(
@@ -151,7 +151,7 @@ class Dump(object):
         conf["nb_atoms"] = int(next(self.f))
 
         # Box
-        line = next(self.f).strip()
+        line = next(self.f).decode().strip()
         if not line.startswith("ITEM: BOX BOUNDS"):
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS Dump file".format(
@@ -167,13 +167,13 @@ class Dump(object):
         conf["box"] = [(None, None), (None, None), (None, None)]
         conf["tilt"] = [0, 0, 0]
         for i in range(3):
-            line = next(self.f)
-            conf["box"][i] = (float(line.split()[0]), float(line.split()[1]))
+            values = next(self.f).split()
+            conf["box"][i] = (float(values[0]), float(values[1]))
             if is_tilt:
-                conf["tilt"][i] = float(line.split()[2])
+                conf["tilt"][i] = float(values[2])
 
         # Atoms
-        line = next(self.f).strip()
+        line = next(self.f).decode().strip()
         if not line.startswith("ITEM: ATOMS"):
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS Dump file".format(
@@ -204,7 +204,7 @@ class Dump(object):
         ----------
         fields : list of str
             List of atom attributes.
-        lines : list of str
+        lines : list of bytes
             Information to transform.
         pandas : bool
             Return atoms as a pandas DataFrame.
@@ -219,8 +219,8 @@ class Dump(object):
         # Atoms is a pandas DataFrame
         if pandas:
             atoms = pd.read_csv(
-                io.StringIO("".join(lines)),
-                " ",
+                io.BytesIO(b"".join(lines)),
+                sep=" ",
                 header=None,
                 names=fields,
                 index_col=False,
@@ -250,16 +250,18 @@ class Dump(object):
             atoms = []
             for line in lines:
                 atom = {}
-                values = line.split()
-                for (field, value) in zip(fields, values):
-                    try:
-                        # Try for int or float
+                values = line.decode().split()
+                for field, value in zip(fields, values):
+                    # Try for int, without raising an exception, or float
+                    if value.isdecimal() or (
+                        value[0] in "+-" and value[1:].isdecimal()
+                    ):
+                        atom[field] = int(value)
+                    else:
                         try:
-                            atom[field] = int(value)
-                        except ValueError:
                             atom[field] = float(value)
-                    except ValueError:
-                        atom[field] = value
+                        except ValueError:
+                            atom[field] = value
                 atoms.append(atom)
             if sort:
                 if "id" not in fields:
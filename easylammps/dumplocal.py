@@ -1,12 +1,14 @@
 """Python library to manage LAMMPS DumpLocal file."""
 
 import io
-import gzip
 import itertools
 import pandas as pd
 import numpy as np
 import functools
 import multiprocessing
+import weakref
+
+from .utils import open_file
 
 
 class DumpLocal(object):
@@ -32,44 +34,43 @@ class DumpLocal(object):
 
     Examples
     --------
+    Compute bond length histograms and close the file on exit:
+
+    >>> with DumpLocal("bond.dump") as f:
+    ...     names, dfs = f.to_hist(groupby="c_BTYPE[*]", field="c_BOND[*]")
     """
 
     def __init__(self, filename="dump.local", raw=True, pandas=True):
 
         self.filename = filename
 
-        # Try first gzip and fall back to normal if failed
-        try:
-            self.f = gzip.open(filename, "rt")
-            # Test the read
-            line = self.f.readline().strip()
-            if line != "ITEM: TIMESTEP":
-                raise ValueError(
-                    "File {:s} does not seem to be a valid LAMMPS DumpLocal file".format(
-                        self.filename
-                    )
-                )
-            self.f.close()
-            # If OK, reopen it
-            self.f = gzip.open(filename, "rt")
-        except IOError:
-            self.f = open(filename, "r")
-            # Test the read
-            line = self.f.readline().strip()
-            if line != "ITEM: TIMESTEP":
-                raise ValueError(
-                    "File {:s} does not seem to be a valid LAMMPS DumpLocal file".format(
-                        self.filename
-                    )
+        # Open in binary mode, only header lines are decoded
+        self.f = open_file(filename)
+        # Close the file if the reader is garbage collected without `with`
+        weakref.finalize(self, self.f.close)
+
+        # Test the read
+        line = self.f.readline().strip()
+        if line != b"ITEM: TIMESTEP":
+            raise ValueError(
+                "File {:s} does not seem to be a valid LAMMPS DumpLocal file".format(
+                    self.filename
                 )
-            self.f.close()
-            # If OK, reopen it
-            self.f = open(filename, "r")
+            )
+        # If OK, rewind it
+        self.f.seek(0)
 
         self.raw = raw
         self.pandas = pandas
 
-    def __del__(self):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the LAMMPS DumpLocal file."""
         try:
             self.f.close()
         except Exception:
@@ -90,7 +91,7 @@ class DumpLocal(object):
         conf = {}
 
         # TimeStep
-        line = next(self.f).strip()
+        line = next(self.f).decode().strip()
         if line == "":
             raise StopIteration
         if line != "ITEM: TIMESTEP":
@@ -102,7 +103,7 @@ class DumpLocal(object):
         conf["timestep"] = int(next(self.f))
 
         # Number of entries
-        line = next(self.f).strip()
+        line = next(self.f).decode().strip()
         if line != "ITEM: NUMBER OF ENTRIES":
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS DumpLocal file".format(
@@ -112,7 +113,7 @@ class DumpLocal(object):
         conf["nb_entries"] = int(next(self.f))
 
         # Box
-        line = next(self.f).strip()
+        line = next(self.f).decode().strip()
         if not line.startswith("ITEM: BOX BOUNDS"):
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS DumpLocal file".format(
@@ -128,13 +129,13 @@ class DumpLocal(object):
         conf["box"] = [(None, None), (None, None), (None, None)]
         conf["tilt"] = [0, 0, 0]
         for i in range(3):
-            line = next(self.f)
-            conf["box"][i] = (float(line.split()[0]), float(line.split()[1]))
+            values = next(self.f).split()
+            conf["box"][i] = (float(values[0]), float(values[1]))
             if is_tilt:
-                conf["tilt"][i] = float(line.split()[2])
+                conf["tilt"][i] = float(values[2])
 
         # Entries
-        line = next(self.f).strip()
+        line = next(self.f).decode().strip()
         if not line.startswith("ITEM: ENTRIES"):
             raise ValueError(
                 "File {:s} does not seem to be a valid LAMMPS DumpLocal file".format(
@@ -163,7 +164,7 @@ class DumpLocal(object):
         ----------
         fields : list of str
             List of entry attributes.
-        lines : list of str
+        lines : list of bytes
             Information to transform.
         pandas : bool
             Return atoms as a pandas DataFrame.
@@ -176,8 +177,8 @@ class DumpLocal(object):
         # Entries is a pandas DataFrame
         if pandas:
             entries = pd.read_csv(
-                io.StringIO("".join(lines)),
-                " ",
+                io.BytesIO(b"".join(lines)),
+                sep=" ",
                 header=None,
                 names=fields,
                 index_col=False,
@@ -188,16 +189,18 @@ class DumpLocal(object):
             entries = []
             for line in lines:
                 entry = {}
-                values = line.split()
-                for (field, value) in zip(fields, values):
-                    try:
-                        # Try for int or float
+                values = line.decode().split()
+                for field, value in zip(fields, values):
+                    # Try for int, without raising an exception, or float
+                    if value.isdecimal() or (
+                        value[0] in "+-" and value[1:].isdecimal()
+                    ):
+                        entry[field] = int(value)
+                    else:
                         try:
-                            entry[field] = int(value)
-                        except ValueError:
                             entry[field] = float(value)
-                    except ValueError:
-                        entry[field] = value
+                        except ValueError:
+                            entry[field] = value
                 entries.append(entry)
 
         return entries
@@ -223,7 +226,7 @@ class DumpLocal(object):
         field : str, optional
             Entry attribute.
         bins : int, default 10
-            Number of bins.
+            Number of bins, the same for each configuration.
         _range : (float, float), optional
             The lower and upper range of the bins.
         norm : bool, default 'True'
@@ -241,28 +244,58 @@ class DumpLocal(object):
         partial_func = functools.partial(
             DumpLocal.conf_compute_hist, *[groupby, field, bins, _range, False]
         )
+        # Join the lines of each configuration before sending it, a single
+        # bytes object is pickled much faster than a list of lines
+        confs = (
+            dict(conf, raw=(conf["fields"], [b"".join(conf["raw"][1])], True))
+            for conf in self
+        )
+
         pool = multiprocessing.Pool(processes=processes)
-        results = pool.imap(partial_func, self)
+        # Send configurations by batches, one task per configuration is
+        # dominated by inter-process communication
+        results = pool.imap(partial_func, confs, chunksize=16)
 
         # Use of dict because names may not be the same for each configuration
-        d = {}
+        coords = {}
+        counts = {}
+        timesteps = {}
 
+        # Counts are summed as arrays, DataFrames are built once at the end
         for names, dfs in results:
             for name, df in zip(names, dfs):
-                try:
-                    # Elegant extraction of the timestep ?
-                    timestep = df.index.get_level_values("TimeStep").values[0]
-                    d[name].index.set_levels([timestep], level="TimeStep", inplace=True)
-                    d[name]["Count"] += df["Count"]
-                except KeyError:
-                    d[name] = df[["Coord", "Count"]]
+                timesteps[name] = df.index.get_level_values("TimeStep")[0]
+                if name in counts:
+                    # String bins, such as 'auto', depend on the configuration
+                    if len(df) != len(counts[name]):
+                        pool.terminate()
+                        raise ValueError(
+                            "Cannot sum histograms of {} and {} bins for group {}, "
+                            "use an integer number of bins".format(
+                                len(counts[name]), len(df), name
+                            )
+                        )
+                    counts[name] += df["Count"].to_numpy()
+                else:
+                    coords[name] = df["Coord"].to_numpy()
+                    counts[name] = df["Count"].to_numpy(copy=True)
 
         # Do not forget to close all processes
         pool.close()
         pool.join()
 
-        names = list(d.keys())
-        dfs = list(d.values())
+        names = list(counts.keys())
+        dfs = []
+
+        for name in names:
+            # Indexed by the last timestep where the group is found
+            iterables = [[timesteps[name]], range(1, len(counts[name]) + 1)]
+            index = pd.MultiIndex.from_product(iterables, names=["TimeStep", "Bin"])
+            dfs.append(
+                pd.DataFrame(
+                    {"Coord": coords[name], "Count": counts[name]}, index=index
+                )
+            )
 
         for df in dfs:
             df["Count/Total"] = df["Count"] / df["Count"].sum()
@@ -302,36 +335,47 @@ class DumpLocal(object):
             where the first index is the timestep and the second
             index is the bin index.
         """
-        # Ensure entries array is a pandas DataFrame
-        conf["raw"] = list(conf["raw"])
-        conf["raw"][2] = True
-        conf["raw"] = tuple(conf["raw"])
-
-        # Entries array is generated here for parallelisability
-        conf["entries"] = DumpLocal.raw2entries(*conf["raw"])
+        # Entries array is generated here for parallelisability, ensure it
+        # is a pandas DataFrame
+        fields, lines, _ = conf["raw"]
+        conf["entries"] = DumpLocal.raw2entries(fields, lines, True)
 
         names = []
         dfs = []
 
-        for name, group in conf["entries"].groupby(groupby, sort=True):
+        # Group entries with NumPy rather than pandas groupby, which is
+        # costly for the few entries of a single configuration
+        codes, uniques = pd.factorize(conf["entries"][groupby], sort=True)
+        values = conf["entries"][field].to_numpy()
+
+        index = None
+
+        for i, name in enumerate(uniques):
             hist, bin_edges = np.histogram(
-                group[field], bins=bins, range=_range, density=False
+                values[codes == i], bins=bins, range=_range, density=False
             )
             centered_bins = (bin_edges[:-1] + bin_edges[1:]) / 2
 
-            iterables = [[conf["timestep"]], range(1, len(hist) + 1)]
-            index = pd.MultiIndex.from_product(iterables, names=["TimeStep", "Bin"])
+            # Groups usually have the same number of bins, the index is
+            # built once per configuration and copied for each group
+            if index is None or len(index) != len(hist):
+                index = pd.MultiIndex(
+                    levels=[[conf["timestep"]], np.arange(1, len(hist) + 1)],
+                    codes=[np.zeros(len(hist), dtype=int), np.arange(len(hist))],
+                    names=["TimeStep", "Bin"],
+                )
 
-            df = pd.DataFrame(
-                {"Coord": centered_bins, "Count": hist},
-                index=index,
-                columns=["Coord", "Count"],
-            )
-            df["Count/Total"] = df["Count"] / df["Count"].sum()
+            # All columns are computed first, the DataFrame is built once
+            columns = {
+                "Coord": centered_bins,
+                "Count": hist,
+                "Count/Total": hist / hist.sum(),
+            }
             if norm:
-                df["Norm"] = df["Count/Total"] / np.trapz(
-                    df["Count/Total"], df["Coord"]
+                columns["Norm"] = columns["Count/Total"] / np.trapz(
+                    columns["Count/Total"], centered_bins
                 )
+            df = pd.DataFrame(columns, index=index.copy())
 
             names.append(name)
             dfs.append(df)
@@ -1,9 +1,12 @@
 """Python library to manage LAMMPS Log file."""
 
+import io
 import logging
-import gzip
+import weakref
 import pandas as pd
 
+from .utils import open_file
+
 
 class Log(object):
     """
@@ -42,27 +45,21 @@ class Log(object):
     0     0.0  1.440000 -0.000002  1.438398  0.014384  90000.000
     1  1000.0  1.957281 -0.000367  1.954739  0.017982  98935.161
     2  2000.0  2.068567 -0.001052  2.065217  0.019467  96307.439
+
+    Read all configurations and close the file on exit:
+
+    >>> with Log("log.27Nov18.colloid.g++.4") as f:
+    ...     df = f.to_pandas()
     """
 
     def __init__(self, filename="log.lammps", run=0):
 
         self.filename = filename
 
-        # Try first gzip and fall back to normal if failed
-        try:
-            self.f = gzip.open(filename, "rt")
-            # Test the read
-            self.f.readline()
-            self.f.close()
-            # If OK, reopen it
-            self.f = gzip.open(filename, "rt")
-        except IOError:
-            self.f = open(filename, "r")
-            # Test the read
-            self.f.readline()
-            self.f.close()
-            # If OK, reopen it
-            self.f = open(filename, "r")
+        # Open in text mode on top of the buffered binary reader
+        self.f = io.TextIOWrapper(open_file(filename))
+        # Close the file if the reader is garbage collected without `with`
+        weakref.finalize(self, self.f.close)
 
         self.run = run
 
@@ -74,7 +71,14 @@ class Log(object):
         if self.run == 0:
             self.seek_next_run()
 
-    def __del__(self):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the LAMMPS Log file."""
         try:
             self.f.close()
         except Exception:
@@ -142,4 +146,63 @@ class Log(object):
         -------
         pandas.DataFrame
         """
-        return pd.DataFrame(list(self))
+        dfs = []
+
+        # Lines of consecutive runs with the same fields, parsed at once
+        lines = []
+        while True:
+            stop = True
+            for line in self.f:
+                # Thermodynamic lines are kept after a single check
+                if not line.startswith(("WARNING", "ERROR", "Loop")):
+                    lines.append(line)
+                    continue
+                if line.startswith("WARNING"):
+                    logging.warning(line.strip())
+                    continue
+                if line.startswith("ERROR"):
+                    logging.error(line.strip())
+                    break
+                stop = self.run != 0
+                break
+
+            if stop:
+                break
+            fields = self.fields
+            self.seek_next_run()
+            if lines and self.fields != fields:
+                dfs.append(self._to_pandas(lines, fields))
+                lines = []
+
+        if lines:
+            dfs.append(self._to_pandas(lines, self.fields))
+
+        if dfs == []:
+            return pd.DataFrame([])
+        return pd.concat(dfs, ignore_index=True)
+
+    def _to_pandas(self, lines, fields):
+        """
+        Convert thermodynamic lines into a pandas DataFrame.
+
+        Parameters
+        ----------
+        lines : list of str
+            Thermodynamic lines of one or several runs.
+        fields : list of str
+            Thermodynamic fields of these runs.
+
+        Returns
+        -------
+        pandas.DataFrame
+        """
+        # Parse all lines at once with the pandas C engine, values beyond
+        # the number of fields are ignored as in `__next__()`
+        return pd.read_csv(
+            io.StringIO("".join(lines)),
+            sep=r"\s+",
+            header=None,
+            names=fields,
+            usecols=range(len(fields)),
+            dtype=float,
+        )
@@ -0,0 +1,187 @@
+"""Python library of helpers shared by LAMMPS file readers."""
+
+import io
+import os
+import weakref
+import numpy as np
+import pandas as pd
+
+# Faster gzip decompression if ISA-L is available
+try:
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
+
+# Parallel gzip decompression, only used on request
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+# Larger than the default buffer size, files are read line by line
+READ_BUFFER_SIZE = 128 * 1024
+
+
+def open_file(filename, parallel=False):
+    """
+    Open a LAMMPS file in binary mode, decompress it if gzipped.
+
+    Parameters
+    ----------
+    filename : str
+        LAMMPS file, may be gzipped.
+    parallel : bool, default False
+        Decompress gzipped file on all cores, requires `rapidgzip`.
+
+    Returns
+    -------
+    file object
+        Buffered binary file object.
+    """
+    # Check the gzip magic number rather than trying to decompress
+    with open(filename, "rb") as f:
+        magic = f.read(2)
+
+    if magic == b"\x1f\x8b" and parallel:
+        if rapidgzip is None:
+            raise ImportError("Parallel decompression requires rapidgzip")
+        raw = rapidgzip.open(filename, parallelization=os.cpu_count())
+        f = io.BufferedReader(raw, buffer_size=READ_BUFFER_SIZE)
+        # Decompression threads must be stopped before the interpreter exits
+        weakref.finalize(f, raw.close)
+        return f
+
+    if magic == b"\x1f\x8b":
+        return io.BufferedReader(
+            gzip.open(filename, "rb"), buffer_size=READ_BUFFER_SIZE
+        )
+    return open(filename, "rb", buffering=READ_BUFFER_SIZE)
+
+
+def read_blocks(f):
+    """
+    Read all remaining configurations of a LAMMPS averaged file at once.
+
+    Each configuration is a first line, whose second value is its number
+    of lines, followed by these lines. A truncated last configuration is
+    kept with the lines available.
+
+    Parameters
+    ----------
+    f : file object
+        Binary file object, positioned at the first line of a configuration.
+
+    Returns
+    -------
+    heads : list of list of bytes
+        Values of the first line of each configuration.
+    nbs : list of int
+        Number of lines read for each configuration.
+    data : bytes
+        Lines of all configurations, without their first line.
+    """
+    data = f.read()
+    if data == b"":
+        return [], [], b""
+    if not data.endswith(b"\n"):
+        data += b"\n"
+
+    # Offsets of all line ends, found at once
+    ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n")) + 1
+
+    heads = []
+    nbs = []
+    blocks = []
+
+    i = 0
+    while i < len(ends):
+        start = ends[i - 1] if i > 0 else 0
+        values = data[start : ends[i]].split()
+        nb = min(int(values[1]), len(ends) - 1 - i)
+        heads.append(values)
+        nbs.append(nb)
+        blocks.append(data[ends[i] : ends[i + nb]])
+        i += nb + 1
+
+    return heads, nbs, b"".join(blocks)
+
+
+def blocks_to_pandas(fields, heads, nbs, data):
+    """
+    Convert configurations read by `read_blocks` into a pandas DataFrame.
+
+    Parameters
+    ----------
+    fields : list of str
+        Names of the columns.
+    heads : list of list
+        Values of the first line of each configuration.
+    nbs : list of int
+        Number of lines of each configuration.
+    data : bytes
+        Lines of all configurations, without their first line.
+
+    Returns
+    -------
+    pandas.DataFrame
+        MultiIndex pandas DataFrame, where the first index
+        is the timestep and the second index is the first field.
+    """
+    if data == b"":
+        return pd.DataFrame([])
+
+    timesteps = [int(values[0]) for values in heads]
+
+    # Parse all configurations at once with the pandas C engine
+    df = pd.read_csv(
+        io.BytesIO(data),
+        sep=r"\s+",
+        header=None,
+        names=fields,
+    )
+    df.index = pd.MultiIndex.from_arrays(
+        [np.repeat(timesteps, nbs), df.pop(fields[0])],
+        names=["TimeStep", fields[0]],
+    )
+
+    return df
+
+
+def parse_block(lines, nb_fields, int_cols):
+    """
+    Parse the lines of a configuration at once, column by column.
+
+    A column is returned as integers only if all its values are written
+    as integers, so that whole float values such as `1e+20` stay floats.
+
+    Parameters
+    ----------
+    lines : list of bytes
+        Lines of the configuration.
+    nb_fields : int
+        Number of values per line.
+    int_cols : list of bool
+        Whether each column has only held integers so far, updated in
+        place. Once a column holds a float value it is never checked again.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        Values of each column.
+    """
+    data = b"".join(lines)
+    block = np.fromstring(data, sep=" ").reshape(len(lines), nb_fields)
+    if any(int_cols):
+        tokens = data.split()
+
+    columns = []
+    for i, values in enumerate(block.T):
+        if int_cols[i]:
+            # Only signs and digits are written, and parsed exactly
+            others = b"".join(tokens[i::nb_fields]).translate(None, b"+-0123456789")
+            int_cols[i] = others == b"" and np.all(np.abs(values) < 2**53)
+        if int_cols[i]:
+            values = values.astype(int)
+        columns.append(values)
+
+    return columns
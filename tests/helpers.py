@@ -0,0 +1,60 @@
+"""Python library of helpers shared by tests of LAMMPS file readers."""
+
+from pathlib import Path
+
+EXAMPLES = Path(__file__).parents[1].joinpath("examples", "dodecane")
+
+
+def read_configuration(filepath, nb_rows=None):
+    """
+    Read the header and the first configuration of a LAMMPS averaged file.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path
+        LAMMPS averaged file.
+    nb_rows : int, optional
+        Keep only the first rows of the configuration.
+
+    Returns
+    -------
+    header : list of str
+        The three header lines.
+    first : list of str
+        Values of the first line of the configuration.
+    rows : list of str
+        Lines of the configuration.
+    """
+    with open(filepath) as f:
+        header = [next(f) for _ in range(3)]
+        first = next(f).split()
+        if nb_rows is not None:
+            first[1] = str(nb_rows)
+        rows = [next(f) for _ in range(int(first[1]))]
+    return header, first, rows
+
+
+def write_configurations(filepath, header, first, rows, nb, truncate=0):
+    """
+    Write `nb` copies of a configuration, the last `truncate` lines removed.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path
+        LAMMPS averaged file to write.
+    header : list of str
+        The three header lines.
+    first : list of str
+        Values of the first line of the configuration.
+    rows : list of str
+        Lines of the configuration.
+    nb : int
+        Number of configurations, at timesteps 150000, 151000, ...
+    truncate : int, default 0
+        Number of lines removed at the end of the file.
+    """
+    content = list(header)
+    for i in range(nb):
+        content.append(" ".join([str(150000 + 1000 * i), *first[1:]]) + "\n")
+        content += rows
+    filepath.write_text("".join(content[: len(content) - truncate]))
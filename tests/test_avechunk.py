@@ -0,0 +1,70 @@
+"""Python library to test LAMMPS AveChunk object."""
+
+import unittest
+import tempfile
+from pathlib import Path
+import numpy as np
+from easylammps import AveChunk
+from helpers import write_configurations
+
+# Configuration of 20 chunks
+CONFIGURATION = (
+    [
+        "# Chunk-averaged data for fix vprof and group all\n",
+        "# Timestep Number-of-chunks Total-count\n",
+        "# Chunk Coord1 Ncount vx\n",
+    ],
+    ["0", "20", "300"],
+    [
+        "  {:d} {:g} {:g} {:g}\n".format(
+            j + 1, 0.05 * j + 0.025, 15.0 + 0.1 * j, -0.01 * j
+        )
+        for j in range(20)
+    ],
+)
+
+
+class AveChunkTest(unittest.TestCase):
+    """Test LAMMPS AveChunk object."""
+
+    def setUp(self):
+        """Create a directory to securely write test files inside."""
+        self.testdir = tempfile.TemporaryDirectory()
+        self.filepath = Path(self.testdir.name).joinpath("test.chunk")
+
+    def tearDown(self):
+        """Remove the test files."""
+        self.testdir.cleanup()
+
+    def test_truncated_file(self):
+        """Read a file whose last configuration is truncated."""
+        write_configurations(self.filepath, *CONFIGURATION, 2, truncate=8)
+        with AveChunk(self.filepath) as f:
+            confs = list(f)
+        self.assertEqual(len(confs), 2)
+        self.assertEqual(len(confs[1]["Coord1"]), 12)
+        np.testing.assert_array_equal(confs[1]["Chunk"], np.arange(1, 13))
+        np.testing.assert_array_equal(confs[1]["Coord1"], confs[0]["Coord1"][:12])
+        # Iterate and convert into a pandas DataFrame consistently
+        with AveChunk(self.filepath) as f:
+            df = f.to_pandas()
+        self.assertEqual(len(df), 20 + 12)
+        np.testing.assert_array_equal(df["Ncount"].loc[151000], confs[1]["Ncount"])
+
+    def test_whole_float_column(self):
+        """Keep whole float values as floats, as in a pandas DataFrame."""
+        header, first, rows = CONFIGURATION
+        rows = ["  1 0.25 150 1e+20\n", "  2 0.75 150 -3e+19\n"]
+        write_configurations(self.filepath, header, ["0", "2", "300"], rows, 2)
+        with AveChunk(self.filepath) as f:
+            confs = list(f)
+        with AveChunk(self.filepath) as f:
+            df = f.to_pandas()
+        for conf in confs:
+            np.testing.assert_array_equal(conf["vx"], [1e20, -3e19])
+            self.assertEqual(conf["vx"].dtype, df["vx"].dtype)
+            self.assertEqual(conf["Ncount"].dtype, df["Ncount"].dtype)
+
+
+if __name__ == "__main__":
+    unittest.main()
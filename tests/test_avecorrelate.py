@@ -0,0 +1,59 @@
+"""Python library to test LAMMPS AveCorrelate object."""
+
+import unittest
+import tempfile
+from pathlib import Path
+import numpy as np
+from easylammps import AveCorrelate
+from helpers import EXAMPLES, read_configuration, write_configurations
+
+CONFIGURATION = read_configuration(EXAMPLES.joinpath("H0Ht.correlate"), nb_rows=100)
+
+
+class AveCorrelateTest(unittest.TestCase):
+    """Test LAMMPS AveCorrelate object."""
+
+    def setUp(self):
+        """Create a directory to securely write test files inside."""
+        self.testdir = tempfile.TemporaryDirectory()
+        self.filepath = Path(self.testdir.name).joinpath("test.correlate")
+
+    def tearDown(self):
+        """Remove the test files."""
+        self.testdir.cleanup()
+
+    def test_truncated_file(self):
+        """Read a file whose last configuration is truncated."""
+        write_configurations(self.filepath, *CONFIGURATION, 2, truncate=70)
+        with AveCorrelate(self.filepath) as f:
+            confs = list(f)
+        self.assertEqual(len(confs), 2)
+        self.assertEqual(len(confs[1]["Index"]), 30)
+        for field in ["Index", "TimeDelta", "Ncount", "c_H[1]*c_H[1]"]:
+            np.testing.assert_array_equal(confs[1][field], confs[0][field][:30])
+        # Iterate and convert into a pandas DataFrame consistently
+        with AveCorrelate(self.filepath) as f:
+            df = f.to_pandas()
+        self.assertEqual(len(df), 100 + 30)
+        np.testing.assert_array_equal(
+            df["TimeDelta"].loc[151000], confs[1]["TimeDelta"]
+        )
+
+    def test_whole_float_column(self):
+        """Keep whole float values as floats, as in a pandas DataFrame."""
+        header, first, rows = CONFIGURATION
+        rows = ["1 0 100 1e+20\n", "2 1 99 -3e+19\n"]
+        header = header[:2] + ["# Index TimeDelta Ncount c_H[1]*c_H[1]\n"]
+        write_configurations(self.filepath, header, ["0", "2"], rows, 2)
+        with AveCorrelate(self.filepath) as f:
+            confs = list(f)
+        with AveCorrelate(self.filepath) as f:
+            df = f.to_pandas()
+        for conf in confs:
+            np.testing.assert_array_equal(conf["c_H[1]*c_H[1]"], [1e20, -3e19])
+            for field in ["TimeDelta", "Ncount", "c_H[1]*c_H[1]"]:
+                self.assertEqual(conf[field].dtype, df[field].dtype)
+
+
+if __name__ == "__main__":
+    unittest.main()
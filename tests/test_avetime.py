@@ -0,0 +1,79 @@
+"""Python library to test LAMMPS AveTime object."""
+
+import unittest
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from easylammps import AveTime
+from helpers import EXAMPLES, read_configuration, write_configurations
+
+CONFIGURATION = read_configuration(EXAMPLES.joinpath("rdf.011.time"))
+
+
+class AveTimeTest(unittest.TestCase):
+    """Test LAMMPS AveTime object."""
+
+    def setUp(self):
+        """Create a directory to securely write test files inside."""
+        self.testdir = tempfile.TemporaryDirectory()
+        self.filepath = Path(self.testdir.name).joinpath("test.time")
+
+    def tearDown(self):
+        """Remove the test files."""
+        self.testdir.cleanup()
+
+    def test_truncated_file(self):
+        """Read a file whose last configuration is truncated."""
+        write_configurations(self.filepath, *CONFIGURATION, 2, truncate=120)
+        with AveTime(self.filepath) as f:
+            confs = list(f)
+        self.assertEqual(len(confs), 2)
+        self.assertEqual(len(confs[1]["Distance"]), 30)
+        for field in ["Row", "Distance", "RDF", "CN"]:
+            np.testing.assert_array_equal(confs[1][field], confs[0][field][:30])
+        # Iterate and convert into a pandas DataFrame consistently
+        with AveTime(self.filepath) as f:
+            df = f.to_pandas()
+        self.assertEqual(len(df), 150 + 30)
+        np.testing.assert_array_equal(df["Distance"].loc[151000], confs[1]["Distance"])
+
+    def test_to_pandas_chunks(self):
+        """Concatenated chunks are the same as a single pandas DataFrame."""
+        write_configurations(self.filepath, *CONFIGURATION, 7, truncate=120)
+        with AveTime(self.filepath) as f:
+            df = f.to_pandas()
+        for chunksize in [1, 3, 7, 10]:
+            with AveTime(self.filepath) as f:
+                chunks = list(f.to_pandas_chunks(chunksize=chunksize))
+            self.assertEqual(len(chunks), -(-7 // chunksize))
+            pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+    def test_to_pandas_chunks_scalar(self):
+        """Concatenated chunks are the same as a single pandas DataFrame."""
+        with AveTime(EXAMPLES.joinpath("pressure.time"), mode="scalar") as f:
+            df = f.to_pandas()
+        with AveTime(EXAMPLES.joinpath("pressure.time"), mode="scalar") as f:
+            chunks = list(f.to_pandas_chunks(chunksize=30000))
+        self.assertEqual(len(chunks), 4)
+        pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+    def test_whole_float_column(self):
+        """Keep whole float values as floats, as in a pandas DataFrame."""
+        header, first, rows = CONFIGURATION
+        rows = ["1 0.25 1e+20 2\n", "2 0.75 -3e+19 4\n"]
+        write_configurations(
+            self.filepath, header, [first[0], "2", *first[2:]], rows, 2
+        )
+        with AveTime(self.filepath) as f:
+            confs = list(f)
+        with AveTime(self.filepath) as f:
+            df = f.to_pandas()
+        for conf in confs:
+            np.testing.assert_array_equal(conf["RDF"], [1e20, -3e19])
+            for field in ["Distance", "RDF", "CN"]:
+                self.assertEqual(conf[field].dtype, df[field].dtype)
+
+
+if __name__ == "__main__":
+    unittest.main()
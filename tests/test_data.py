@@ -5,6 +5,8 @@ import tempfile
 from pathlib import Path
 from easylammps import Data
 
+EXAMPLES = Path(__file__).parents[1].joinpath("examples", "dodecane")
+
 
 class DataTest(unittest.TestCase):
     """Test LAMMPS Data object."""
@@ -21,6 +23,105 @@ class DataTest(unittest.TestCase):
         expected = filepath.read_text()
         self.assertMultiLineEqual(content, expected)
 
+    def test_reset_mol_i(self):
+        """Recover molecule indices of LAMMPS data files from bonds."""
+        for filepath in [
+            EXAMPLES.joinpath("end.data"),
+            EXAMPLES.joinpath("system.data"),
+            Path(__file__).parent.joinpath("data", "butane.data"),
+        ]:
+            data = Data(filepath)
+            expected = [atom["mol_i"] for atom in data.atoms]
+            data.reset_mol_i()
+            self.assertEqual([atom["mol_i"] for atom in data.atoms], expected)
+
+    def test_reset_mol_i_disconnected(self):
+        """Number molecules in order of their first atom, isolated atoms included."""
+        data = Data()
+        data.add_atom_type(mass=1.0)
+        for _ in range(7):
+            data.add_atom(mol_i=1, atom_type=data.atom_types[0])
+        # Atoms 3 and 7 are isolated, atoms 1 and 6 are only bonded through 4
+        for atom_is in [(1, 4), (6, 4), (5, 2)]:
+            data.add_bond(atom_is)
+        data.reset_mol_i()
+        self.assertEqual([atom["mol_i"] for atom in data.atoms], [1, 2, 3, 1, 2, 1, 4])
+
+    def build_ethanol_like(self):
+        """Build a small molecule whose atom types and topology types are duplicated."""
+        data = Data()
+        # Atom types 1 and 3 are the same
+        for mass, comment in [(12.0, "C"), (1.0, "H"), (12.0, "C"), (16.0, "O")]:
+            data.add_atom_type(mass=mass, comment=comment)
+        for i in [1, 2, 3, 4, 2]:
+            data.add_atom(mol_i=1, atom_type=data.atom_types[i - 1])
+        # Topology types only differ by their atom types
+        data.add_bond_type(coeffs=[1.0], style="harmonic")
+        data.add_angle_type(coeffs=[1.0], style="harmonic")
+        data.add_dihedral_type(coeffs=[1.0], style="harmonic")
+        data.add_improper_type(coeffs=[1.0], style="harmonic")
+        for atom_is in [(1, 2), (5, 3), (1, 3), (3, 4)]:
+            data.add_bond(atom_is, bond_type=data.bond_types[0])
+        for atom_is in [(2, 1, 3), (1, 3, 5), (1, 3, 4)]:
+            data.add_angle(atom_is, angle_type=data.angle_types[0])
+        for atom_is in [(2, 1, 3, 4), (2, 1, 3, 5)]:
+            data.add_dihedral(atom_is, dihedral_type=data.dihedral_types[0])
+        # Same improper type, atoms of the second improper are out of order
+        for atom_is in [(3, 1, 4, 5), (3, 5, 1, 4)]:
+            data.add_improper(atom_is, improper_type=data.improper_types[0])
+        return data
+
+    def test_reset_all_types(self):
+        """Merge duplicated types, matching atom types in both directions."""
+        data = self.build_ethanol_like()
+        data.reset_all_types()
+        self.assertEqual(
+            [atom["atom_type"]["i"] for atom in data.atoms], [1, 2, 1, 3, 2]
+        )
+        self.assertEqual(
+            [atom_type["mass"] for atom_type in data.atom_types], [12.0, 1.0, 16.0]
+        )
+        self.assertEqual([bond["bond_type"]["i"] for bond in data.bonds], [1, 1, 2, 3])
+        self.assertEqual([angle["angle_type"]["i"] for angle in data.angles], [1, 1, 2])
+        self.assertEqual(
+            [dihedral["dihedral_type"]["i"] for dihedral in data.dihedrals], [1, 2]
+        )
+        self.assertEqual(
+            [improper["improper_type"]["i"] for improper in data.impropers], [1, 1]
+        )
+        self.assertEqual(len(data.bond_types), 3)
+        self.assertEqual(len(data.angle_types), 2)
+        self.assertEqual(len(data.dihedral_types), 2)
+        self.assertEqual(len(data.improper_types), 1)
+        self.assertNotIn("atom_types", data.improper_types[0])
+        # Atoms of the second improper are reordered as the first one
+        for improper in data.impropers:
+            self.assertEqual(
+                [improper["atom{}".format(j)]["i"] for j in range(1, 5)], [3, 1, 4, 5]
+            )
+
+    def test_reset_all_types_without_match_atypes(self):
+        """Merge duplicated types whatever their atom types."""
+        data = self.build_ethanol_like()
+        data.reset_all_types(match_atypes=False)
+        self.assertEqual(
+            [atom["atom_type"]["i"] for atom in data.atoms], [1, 2, 1, 3, 2]
+        )
+        self.assertEqual([bond["bond_type"]["i"] for bond in data.bonds], [1, 1, 1, 1])
+        self.assertEqual([angle["angle_type"]["i"] for angle in data.angles], [1, 1, 1])
+        self.assertEqual(
+            [dihedral["dihedral_type"]["i"] for dihedral in data.dihedrals], [1, 1]
+        )
+        self.assertEqual(len(data.bond_types), 1)
+        self.assertEqual(len(data.angle_types), 1)
+        self.assertEqual(len(data.dihedral_types), 1)
+        # Impropers always match atom types
+        self.assertEqual(len(data.improper_types), 1)
+        self.assertEqual(
+            [data.impropers[1]["atom{}".format(j)]["i"] for j in range(1, 5)],
+            [3, 1, 4, 5],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,21 @@
+"""Python library to test LAMMPS DumpLocal object."""
+
+import unittest
+from pathlib import Path
+from easylammps import DumpLocal
+
+EXAMPLES = Path(__file__).parents[1].joinpath("examples", "dodecane")
+
+
+class DumpLocalTest(unittest.TestCase):
+    """Test LAMMPS DumpLocal object."""
+
+    def test_to_hist_string_bins(self):
+        """Refuse to sum histograms whose number of bins changes."""
+        with DumpLocal(EXAMPLES.joinpath("bond.dump")) as f:
+            with self.assertRaisesRegex(ValueError, "integer number of bins"):
+                f.to_hist(groupby="c_BTYPE[*]", field="c_BOND[*]", bins="auto")
+
+
+if __name__ == "__main__":
+    unittest.main()
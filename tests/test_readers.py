@@ -0,0 +1,74 @@
+"""Python library to test behaviours shared by LAMMPS file readers."""
+
+import gc
+import unittest
+import tempfile
+from pathlib import Path
+from easylammps import (
+    AveChunk,
+    AveCorrelate,
+    AveHisto,
+    AveTime,
+    Dump,
+    DumpLocal,
+    Log,
+)
+from helpers import EXAMPLES
+
+CHUNK = """# Chunk-averaged data for fix vprof and group all
+# Timestep Number-of-chunks Total-count
+# Chunk Coord1 Ncount vx
+1000 2 300
+  1 0.25 150 0.01
+  2 0.75 150 -0.01
+"""
+
+
+class ReadersTest(unittest.TestCase):
+    """Test behaviours shared by LAMMPS file readers."""
+
+    def setUp(self):
+        """Create a directory to securely write test files inside."""
+        self.testdir = tempfile.TemporaryDirectory()
+        chunkpath = Path(self.testdir.name).joinpath("test.chunk")
+        chunkpath.write_text(CHUNK)
+        self.readers = [
+            (AveChunk, chunkpath),
+            (AveCorrelate, EXAMPLES.joinpath("P0Pt.correlate")),
+            (AveHisto, EXAMPLES.joinpath("gyration.histo")),
+            (AveTime, EXAMPLES.joinpath("rdf.011.time")),
+            (Dump, EXAMPLES.joinpath("dump.lammpstrj")),
+            (DumpLocal, EXAMPLES.joinpath("bond.dump")),
+            (Log, EXAMPLES.joinpath("log.lammps")),
+        ]
+
+    def tearDown(self):
+        """Remove the test files."""
+        self.testdir.cleanup()
+
+    def test_context_manager(self):
+        """Close the file on exit, also on error."""
+        for reader, filepath in self.readers:
+            with self.subTest(reader=reader.__name__):
+                with reader(filepath) as f:
+                    next(f)
+                self.assertTrue(f.f.closed)
+                with self.assertRaises(RuntimeError):
+                    with reader(filepath) as f:
+                        raise RuntimeError
+                self.assertTrue(f.f.closed)
+
+    def test_finalizer(self):
+        """Close the file when the reader is garbage collected without `with`."""
+        for reader, filepath in self.readers:
+            with self.subTest(reader=reader.__name__):
+                f = reader(filepath)
+                next(f)
+                file = f.f
+                del f
+                gc.collect()
+                self.assertTrue(file.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Python library to test helpers shared by LAMMPS file readers."""
+
+import unittest
+import tempfile
+import gzip
+from pathlib import Path
+from unittest import mock
+from easylammps import utils
+from easylammps.utils import open_file, read_blocks
+
+BLOCKS = b"100 2\n1 a\n2 b\n200 3\n1 c\n2 d\n3 e\n"
+
+
+class UtilsTest(unittest.TestCase):
+    """Test helpers shared by LAMMPS file readers."""
+
+    def setUp(self):
+        """Create a directory to securely write test files inside."""
+        self.testdir = tempfile.TemporaryDirectory()
+        self.filepath = Path(self.testdir.name).joinpath("test.time")
+
+    def tearDown(self):
+        """Remove the test files."""
+        self.testdir.cleanup()
+
+    def test_open_file(self):
+        """Read the same content from a plain and a gzipped file."""
+        self.filepath.write_bytes(BLOCKS)
+        with open_file(self.filepath) as f:
+            self.assertEqual(f.read(), BLOCKS)
+        with gzip.open(self.filepath, "wb") as f:
+            f.write(BLOCKS)
+        self.assertNotEqual(self.filepath.read_bytes(), BLOCKS)
+        with open_file(self.filepath) as f:
+            self.assertEqual(f.read(), BLOCKS)
+
+    def test_open_file_parallel(self):
+        """Require rapidgzip to decompress a gzipped file in parallel."""
+        # Plain files are read as usual
+        self.filepath.write_bytes(BLOCKS)
+        with mock.patch.object(utils, "rapidgzip", None):
+            with open_file(self.filepath, parallel=True) as f:
+                self.assertEqual(f.read(), BLOCKS)
+        with gzip.open(self.filepath, "wb") as f:
+            f.write(BLOCKS)
+        with mock.patch.object(utils, "rapidgzip", None):
+            with self.assertRaisesRegex(ImportError, "rapidgzip"):
+                open_file(self.filepath, parallel=True)
+
+    @unittest.skipIf(utils.rapidgzip is None, "rapidgzip is not installed")
+    def test_open_file_parallel_rapidgzip(self):
+        """Read the same content with parallel decompression."""
+        with gzip.open(self.filepath, "wb") as f:
+            f.write(BLOCKS * 1000)
+        with open_file(self.filepath, parallel=True) as f:
+            self.assertEqual(f.read(), BLOCKS * 1000)
+        with open_file(self.filepath, parallel=True) as f:
+            self.assertEqual(read_blocks(f)[1], [2, 3] * 1000)
+
+    def test_read_blocks(self):
+        """Split configurations into first lines and data."""
+        self.filepath.write_bytes(BLOCKS)
+        with open_file(self.filepath) as f:
+            heads, nbs, data = read_blocks(f)
+        self.assertEqual(heads, [[b"100", b"2"], [b"200", b"3"]])
+        self.assertEqual(nbs, [2, 3])
+        self.assertEqual(data, b"1 a\n2 b\n1 c\n2 d\n3 e\n")
+
+    def test_read_blocks_no_trailing_newline(self):
+        """Keep the last line of a file without trailing newline."""
+        self.filepath.write_bytes(BLOCKS[:-1])
+        with open_file(self.filepath) as f:
+            heads, nbs, data = read_blocks(f)
+        self.assertEqual(nbs, [2, 3])
+        self.assertEqual(data, b"1 a\n2 b\n1 c\n2 d\n3 e\n")
+
+    def test_read_blocks_truncated(self):
+        """Keep the lines available of a truncated last configuration."""
+        self.filepath.write_bytes(BLOCKS[: BLOCKS.index(b"3 e")])
+        with open_file(self.filepath) as f:
+            heads, nbs, data = read_blocks(f)
+        self.assertEqual(heads, [[b"100", b"2"], [b"200", b"3"]])
+        self.assertEqual(nbs, [2, 2])
+        self.assertEqual(data, b"1 a\n2 b\n1 c\n2 d\n")
+        # Only the first line of the last configuration is written
+        self.filepath.write_bytes(BLOCKS[: BLOCKS.index(b"1 c")])
+        with open_file(self.filepath) as f:
+            heads, nbs, data = read_blocks(f)
+        self.assertEqual(heads, [[b"100", b"2"], [b"200", b"3"]])
+        self.assertEqual(nbs, [2, 0])
+        self.assertEqual(data, b"1 a\n2 b\n")
+
+    def test_read_blocks_empty(self):
+        """Read nothing once all configurations are read."""
+        self.filepath.write_bytes(BLOCKS)
+        with open_file(self.filepath) as f:
+            f.read()
+            self.assertEqual(read_blocks(f), ([], [], b""))
+        self.filepath.write_bytes(b"")
+        with open_file(self.filepath) as f:
+            self.assertEqual(read_blocks(f), ([], [], b""))
+
+
+if __name__ == "__main__":
+    unittest.main()